@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Dispatch Micro-Benchmark
+
+Per-message cost of EXEC dispatch across the built-in OpCodes,
+comparing:
+- dict:  dict lookups on message type and opcode, guarded payload
+         decoding (the original dispatch path, reproduced here)
+- table: 256-entry DispatchTable lists and one-call operand unpack
+
+"decode" times only type lookup + operand decode + op call; "full"
+includes building and queueing the EXEC_OK response.
+
+Usage:
+    python bench_dispatch.py [--n N]
+"""
+
+import sys
+import argparse
+import timeit
+from pathlib import Path
+
+# Add source to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from hsquares_os.message import Message, exec_msg, exec_ok_msg
+from hsquares_os.node_kernel import NodeKernel, NodeStatus, OpCode, _unpack_operands
+
+
+BUILTIN_OPS = [
+    OpCode.NOP, OpCode.ADD, OpCode.SUB, OpCode.CMP, OpCode.AND,
+    OpCode.OR, OpCode.XOR, OpCode.SHIFT_L, OpCode.SHIFT_R,
+]
+
+
+def dict_dispatch(kernel: NodeKernel, handlers: dict, op_handlers: dict, msg: Message):
+    """The original dict-based _dispatch + _handle_exec path."""
+    handler = handlers.get(msg.msg_type)
+    if handler:
+        kernel.status = NodeStatus.BUSY
+        payload = msg.payload
+        opcode = payload[0] if len(payload) > 0 else 0
+        a = payload[1] if len(payload) > 1 else 0
+        b = payload[2] if len(payload) > 2 else 0
+        flags = payload[3] if len(payload) > 3 else 0
+        op = op_handlers.get(opcode)
+        result, extra = op(a, b, flags)
+        kernel.send_message(exec_ok_msg(kernel.node_id, msg.src_node, msg.msg_id, result, extra))
+        kernel.status = NodeStatus.IDLE
+
+
+def dict_decode(handlers: dict, op_handlers: dict, msg: Message):
+    """Original lookup + decode + op call, without the response."""
+    handlers.get(msg.msg_type)
+    payload = msg.payload
+    opcode = payload[0] if len(payload) > 0 else 0
+    a = payload[1] if len(payload) > 1 else 0
+    b = payload[2] if len(payload) > 2 else 0
+    flags = payload[3] if len(payload) > 3 else 0
+    return op_handlers.get(opcode)(a, b, flags)
+
+
+def table_decode(kernel: NodeKernel, msg: Message):
+    """Table lookup + decode + op call, without the response."""
+    kernel.handlers.table[msg.msg_type]
+    opcode, a, b, flags = _unpack_operands(msg._payload)
+    return kernel._op_handlers.table[opcode](a, b, flags)
+
+
+def bench(stmt, n: int) -> float:
+    """Best of 5, ns per call."""
+    return min(timeit.repeat(stmt, number=n, repeat=5)) / n * 1e9
+
+
+def run_benchmark(n: int = 100000) -> dict:
+    """
+    Run the dispatch comparison.
+    
+    Returns op name → (decode dict ns, decode table ns, full dict ns, full table ns).
+    """
+    kernel = NodeKernel(node_id=1)
+    handlers = dict(kernel.handlers)
+    op_handlers = dict(kernel._op_handlers)
+    outbox = kernel.outbox
+    
+    results = {}
+    for op in BUILTIN_OPS:
+        msg = exec_msg(0, 1, 7, op, 200, 100, 0)
+        
+        old_decode = lambda: dict_decode(handlers, op_handlers, msg)
+        new_decode = lambda: table_decode(kernel, msg)
+        
+        def old():
+            dict_dispatch(kernel, handlers, op_handlers, msg)
+            outbox.clear()
+        
+        def new():
+            kernel._dispatch(msg)
+            outbox.clear()
+        
+        results[op.name] = (
+            bench(old_decode, n), bench(new_decode, n),
+            bench(old, n), bench(new, n),
+        )
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Dispatch Micro-Benchmark')
+    parser.add_argument('--n', type=int, default=100000,
+                        help='Messages per measurement')
+    
+    args = parser.parse_args()
+    
+    print("=" * 60)
+    print("DISPATCH BENCHMARK (EXEC, ns/msg)")
+    print("=" * 60)
+    print(f"  {'':<10} {'--------- decode ---------':>28} {'---------- full ----------':>28}")
+    print(f"  {'op':<10} {'dict':>8} {'table':>8} {'speedup':>9} "
+          f"{'dict':>8} {'table':>8} {'speedup':>9}")
+    
+    results = run_benchmark(args.n)
+    rows = list(results.items())
+    rows.append(('mean', [
+        sum(r[i] for r in results.values()) / len(results) for i in range(4)
+    ]))
+    for name, (od, nd, of, nf) in rows:
+        print(f"  {name:<10} {od:8.0f} {nd:8.0f} {od / nd:8.2f}x "
+              f"{of:8.0f} {nf:8.0f} {of / nf:8.2f}x")
+
+
+if __name__ == '__main__':
+    main()
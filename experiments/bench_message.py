@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Message Frame Micro-Benchmark
+
+Measures per-message cost of the hot-path operations on Message:
+- construction via the factory functions
+- response() construction
+- to_bytes / from_bytes round trip
+- pooled factory allocation (MessagePool)
+- batch encode_frames / decode_frames
+
+Usage:
+    python bench_message.py [--n N]
+"""
+
+import sys
+import argparse
+import timeit
+from pathlib import Path
+
+# Add source to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from hsquares_os.message import (
+    Message, MessageType, exec_msg, exec_ok_msg, pong_msg,
+    encode_frames, decode_frames, MessagePool, set_message_pool,
+)
+
+
+def bench(label: str, stmt, n: int, per: int = 1) -> float:
+    """Run stmt n times (best of 5), print and return ns per message."""
+    best = min(timeit.repeat(stmt, number=n, repeat=5))
+    ns = best / (n * per) * 1e9
+    print(f"  {label:<28} {ns:8.0f} ns/msg")
+    return ns
+
+
+def run_benchmark(n: int = 100000) -> dict:
+    """Run all message benchmarks. Returns label → ns per call."""
+    req = exec_msg(0, 1, 7, 0x01, 50, 10, 0)
+    frame = req.to_bytes()
+    
+    results = {}
+    results['Message()'] = bench(
+        'Message()', lambda: Message(MessageType.EXEC, 1, 0, 1, b'\x01\x02'), n)
+    results['exec_msg'] = bench(
+        'exec_msg', lambda: exec_msg(0, 1, 7, 0x01, 50, 10, 0), n)
+    results['exec_ok_msg'] = bench(
+        'exec_ok_msg', lambda: exec_ok_msg(1, 0, 7, 60, 0), n)
+    results['pong_msg'] = bench(
+        'pong_msg', lambda: pong_msg(1, 0, 7, 1, 0), n)
+    results['response()'] = bench(
+        'response()', lambda: req.response(b'\x3c'), n)
+    results['payload_len'] = bench(
+        'payload_len', lambda: req.payload_len, n)
+    results['to_bytes'] = bench(
+        'to_bytes', req.to_bytes, n)
+    results['from_bytes'] = bench(
+        'from_bytes', lambda: Message.from_bytes(frame), n)
+    
+    # Pooled factories: acquire + release per message
+    set_message_pool(MessagePool())
+    results['exec_msg (pooled)'] = bench(
+        'exec_msg (pooled)', lambda: exec_msg(0, 1, 7, 0x01, 50, 10, 0).release(), n)
+    results['exec_ok_msg (pooled)'] = bench(
+        'exec_ok_msg (pooled)', lambda: exec_ok_msg(1, 0, 7, 60, 0).release(), n)
+    set_message_pool(None)
+    
+    # Batch codec, 1000 frames per call
+    batch = [req] * 1000
+    buf = encode_frames(batch)
+    results['encode_frames'] = bench(
+        'encode_frames (per frame)', lambda: encode_frames(batch), n // 1000, 1000)
+    results['decode_frames'] = bench(
+        'decode_frames (per frame)', lambda: decode_frames(buf), n // 1000, 1000)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Message Frame Micro-Benchmark')
+    parser.add_argument('--n', type=int, default=100000,
+                        help='Calls per measurement')
+    
+    args = parser.parse_args()
+    
+    print("=" * 60)
+    print("MESSAGE FRAME BENCHMARK")
+    print("=" * 60)
+    run_benchmark(args.n)
+
+
+if __name__ == '__main__':
+    main()
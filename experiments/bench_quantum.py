@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Processing Budget Benchmark
+
+Throughput vs. per-tick message quantum:
+- pipelined EXEC requests spread over all workers
+- repeated broadcasts (responses serialize at the master)
+
+Usage:
+    python bench_quantum.py [--workers N] [--requests N] [--quanta 1,2,4,8,16]
+"""
+
+import sys
+import time
+import argparse
+from pathlib import Path
+
+# Add source to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from hsquares_os import HSquaresOS
+from hsquares_os.node_kernel import OpCode
+
+
+def run_pipeline(quantum: int, workers: int, requests: int) -> dict:
+    """Drain `requests` pipelined ADDs. Returns throughput metrics."""
+    os = HSquaresOS(num_workers=workers, scheduler='ready', quantum=quantum)
+    os.boot()
+    
+    start_tick = os.tick_count
+    start = time.perf_counter()
+    handles = [
+        os.submit(1 + i % workers, OpCode.ADD, i & 0xFF, 1)
+        for i in range(requests)
+    ]
+    os.drain()
+    elapsed = time.perf_counter() - start
+    ticks = os.tick_count - start_tick
+    
+    return {
+        'ticks': ticks,
+        'per_tick': requests / max(1, ticks),
+        'ok': sum(1 for h in handles if h.ok),
+        'seconds': elapsed,
+    }
+
+
+def run_broadcast(quantum: int, workers: int, rounds: int) -> dict:
+    """Time `rounds` broadcast_exec calls in ticks."""
+    os = HSquaresOS(num_workers=workers, scheduler='ready', quantum=quantum)
+    os.boot()
+    
+    start_tick = os.tick_count
+    for i in range(rounds):
+        os.broadcast_exec(OpCode.ADD, i & 0xFF, 1)
+    
+    return {'ticks_per_round': (os.tick_count - start_tick) / rounds}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Processing Budget Benchmark')
+    parser.add_argument('--workers', type=int, default=8,
+                        help='Number of worker nodes')
+    parser.add_argument('--requests', type=int, default=5000,
+                        help='Pipelined requests per run')
+    parser.add_argument('--rounds', type=int, default=50,
+                        help='Broadcast rounds per run')
+    parser.add_argument('--quanta', type=str, default='1,2,4,8,16',
+                        help='Comma-separated quanta to compare')
+    
+    args = parser.parse_args()
+    quanta = [int(q) for q in args.quanta.split(',')]
+    
+    print("=" * 60)
+    print("PROCESSING BUDGET BENCHMARK")
+    print(f"{args.workers} workers, {args.requests} requests, "
+          f"{args.rounds} broadcasts")
+    print("=" * 60)
+    print(f"  {'quantum':>7} {'ticks':>8} {'req/tick':>9} {'ok':>7} "
+          f"{'wall s':>8} {'bcast ticks':>12}")
+    
+    for q in quanta:
+        p = run_pipeline(q, args.workers, args.requests)
+        b = run_broadcast(q, args.workers, args.rounds)
+        print(f"  {q:>7} {p['ticks']:>8} {p['per_tick']:>9.2f} {p['ok']:>7} "
+              f"{p['seconds']:>8.3f} {b['ticks_per_round']:>12.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Tracing Overhead Benchmark
+
+Ticks per second of a loaded fabric at each trace level:
+- off:      nothing recorded
+- errors:   only error events (none occur here)
+- control:  errors plus lifecycle events
+- full:     every SEND and RECV
+
+The workload keeps all workers busy with pipelined EXEC requests,
+so almost every tick moves messages.
+
+Usage:
+    python bench_trace.py [--workers N] [--requests N] [--repeat N]
+"""
+
+import sys
+import time
+import argparse
+from pathlib import Path
+
+# Add source to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from hsquares_os import HSquaresOS
+from hsquares_os.node_kernel import OpCode
+from hsquares_os.trace import TRACE_LEVELS
+
+
+def run_level(level: str, workers: int, requests: int, scheduler: str) -> dict:
+    """Drain `requests` pipelined ADDs with tracing at `level`."""
+    os = HSquaresOS(num_workers=workers, scheduler=scheduler, trace_level=level)
+    os.boot()
+    
+    start_tick = os.tick_count
+    start_entries = sum(buf.total for buf in os.fabric.trace_buffers)
+    start = time.perf_counter()
+    for i in range(requests):
+        os.submit(1 + i % workers, OpCode.ADD, i & 0xFF, 1).add_done_callback(
+            lambda h: h.release())
+    os.drain()
+    elapsed = time.perf_counter() - start
+    ticks = os.tick_count - start_tick
+    
+    return {
+        'ticks': ticks,
+        'ticks_per_sec': ticks / elapsed,
+        'msgs_per_sec': os.bus.delivered / elapsed,
+        'entries': sum(buf.total for buf in os.fabric.trace_buffers) - start_entries,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Tracing Overhead Benchmark')
+    parser.add_argument('--workers', type=int, default=8,
+                        help='Number of worker nodes')
+    parser.add_argument('--requests', type=int, default=20000,
+                        help='Pipelined requests per run')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='Runs per level (best is reported)')
+    parser.add_argument('--scheduler', type=str, default='full',
+                        choices=HSquaresOS.SCHEDULERS,
+                        help='Node scheduler')
+    
+    args = parser.parse_args()
+    
+    print("=" * 60)
+    print("TRACING OVERHEAD BENCHMARK")
+    print(f"{args.workers} workers, {args.requests} requests, "
+          f"{args.scheduler} scheduler, best of {args.repeat}")
+    print("=" * 60)
+    print(f"  {'level':<8} {'ticks':>7} {'ticks/s':>9} {'msgs/s':>9} "
+          f"{'entries':>8} {'vs off':>7}")
+    
+    baseline = None
+    for level in TRACE_LEVELS:
+        runs = [run_level(level, args.workers, args.requests, args.scheduler)
+                for _ in range(args.repeat)]
+        best = max(runs, key=lambda r: r['ticks_per_sec'])
+        if baseline is None:
+            baseline = best['ticks_per_sec']
+        print(f"  {level:<8} {best['ticks']:>7} {best['ticks_per_sec']:>9.0f} "
+              f"{best['msgs_per_sec']:>9.0f} {best['entries']:>8} "
+              f"{best['ticks_per_sec'] / baseline:>6.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -13,14 +13,25 @@ Components:
 - NodeKernel: Runs on every node (mailbox, dispatcher, scheduler)
 - FabricKernel: Runs on master (directory, router, supervisor)
 - Message: Fixed-size message frame
+- MessageLog: Binary log of bus deliveries (record/replay)
+- PagedMemory / MemoryArena: Node memory models
+- OpTables: Precomputed built-in op tables, batch evaluation
+- TimerWheel: Hierarchical timer service
+- TraceSink / TraceReader: Binary trace files
 - HSquaresOS: Complete 1×8 system
+- AsyncHSquaresOS: asyncio front-end
 - SquaresShell: Bash-like interface (sqsh)
 """
 
-from .message import Message, MessageType, MessageFlags
-from .node_kernel import NodeKernel, NodeStatus, OpCode
+from .message import Message, MessageType, MessageFlags, MessagePool, MessageLog
+from .node_kernel import NodeKernel, NodeStatus, OpCode, Pending
+from .memory import PagedMemory, MemoryArena
+from .lut import OpTables
+from .timers import TimerWheel
+from .trace_file import TraceSink, TraceReader
 from .fabric_kernel import FabricKernel
-from .system import HSquaresOS
+from .system import HSquaresOS, RequestHandle
+from .async_system import AsyncHSquaresOS
 from .shell import SquaresShell
 from .sorting_network import SortingNetwork
 from .sorting_fabric import SortingFabric
@@ -31,11 +42,22 @@ __all__ = [
     'Message',
     'MessageType', 
     'MessageFlags',
+    'MessagePool',
+    'MessageLog',
     'NodeKernel',
     'NodeStatus',
     'OpCode',
+    'Pending',
+    'PagedMemory',
+    'MemoryArena',
+    'OpTables',
+    'TimerWheel',
+    'TraceSink',
+    'TraceReader',
     'FabricKernel',
     'HSquaresOS',
+    'RequestHandle',
+    'AsyncHSquaresOS',
     'SquaresShell',
     'SortingNetwork',
     'SortingFabric',
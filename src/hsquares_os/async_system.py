@@ -0,0 +1,152 @@
+"""
+ASYNC FRONT-END
+
+asyncio wrapper around HSquaresOS.
+
+Many coroutines can share one fabric. Each call submits its request
+and awaits a future resolved by the request's completion callback;
+a single driver task advances the tick loop while anything is
+outstanding (fast-forwarding idle stretches where the fabric can) and
+yields to the event loop between steps. Timeouts are request
+deadlines on the fabric (HSquaresOS.set_deadline with on_send), so
+they count from when a request goes on the wire, not time spent
+queued behind the in-flight window. Handles are released once their
+result has been handed to the future.
+
+Usage:
+    aos = AsyncHSquaresOS(HSquaresOS())
+    aos.os.boot()
+    
+    results = await asyncio.gather(*(
+        aos.exec_async(node=n, op=OpCode.ADD, a=n, b=1)
+        for n in range(1, 9)
+    ))
+"""
+
+import asyncio
+from typing import Dict, Optional, Tuple
+
+from .system import HSquaresOS, RequestHandle
+
+
+class AsyncHSquaresOS:
+    """
+    Async interface to an HSquaresOS.
+    
+    Timeouts are in ticks: a request not answered within `timeout`
+    ticks of being sent resolves to None.
+    """
+    
+    def __init__(self, os: Optional[HSquaresOS] = None, ticks_per_yield: int = 1):
+        if ticks_per_yield < 1:
+            raise ValueError("ticks_per_yield must be at least 1")
+        self.os = os or HSquaresOS()
+        self.ticks_per_yield = ticks_per_yield
+        
+        self._outstanding = 0  # Futures not yet resolved
+        self._driver: Optional[asyncio.Task] = None
+    
+    # ========== Driver ==========
+    
+    def _track(self, handle: RequestHandle, timeout: int) -> asyncio.Future:
+        """Bind a handle to a future and make sure the driver is running."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._outstanding += 1
+        self.os.set_deadline(handle, timeout, on_send=True)
+        
+        def on_done(h: RequestHandle):
+            self._settle(future, h.result())
+            h.release()
+        
+        def on_cancel(f: asyncio.Future):
+            if f.cancelled():
+                self._outstanding -= 1
+                self.os.cancel(handle)
+                handle.release()
+        
+        future.add_done_callback(on_cancel)
+        handle.add_done_callback(on_done)
+        
+        if self._driver is None or self._driver.done():
+            self._driver = loop.create_task(self._drive())
+        
+        return future
+    
+    def _settle(self, future: asyncio.Future, result):
+        """Resolve a future unless it was already resolved or cancelled."""
+        if not future.done():
+            self._outstanding -= 1
+            future.set_result(result)
+    
+    async def _drive(self):
+        """Advance the fabric while any request is outstanding."""
+        while self._outstanding > 0:
+            ticks = 0
+            while ticks < self.ticks_per_yield and self._outstanding > 0:
+                ticks += self.os._advance(self.ticks_per_yield - ticks)
+            await asyncio.sleep(0)
+    
+    @property
+    def outstanding(self) -> int:
+        """Number of requests currently awaited."""
+        return self._outstanding
+    
+    # ========== Operations ==========
+    
+    async def exec_async(self, node: int, op: int, a: int = 0, b: int = 0,
+                         flags: int = 0, timeout: int = 100) -> Optional[Tuple[int, int]]:
+        """
+        Execute an operation on a specific node.
+        
+        Returns (result, extra) or None on timeout.
+        """
+        return await self._track(self.os.submit(node, op, a, b, flags), timeout)
+    
+    async def compute_async(self, node: int, op: int, a: int, b: int,
+                            flags: int = 0, timeout: int = 100) -> Optional[Tuple[int, int]]:
+        """
+        Execute a neural compute operation on a specific node.
+        
+        Returns (result, flags) or None on timeout.
+        """
+        return await self._track(self.os.submit_compute(node, op, a, b, flags), timeout)
+    
+    async def ping_async(self, node: int, timeout: int = 50) -> Optional[Tuple[int, int]]:
+        """
+        Ping a node.
+        
+        Returns (status, load) or None on timeout.
+        """
+        return await self._track(self.os.submit_ping(node), timeout)
+    
+    async def route_async(self, op: int, a: int = 0, b: int = 0,
+                          flags: int = 0, timeout: int = 100) -> Optional[Tuple[int, int, int]]:
+        """
+        Route work to best available node.
+        
+        Returns (node, result, extra) or None if no nodes available.
+        """
+        node = self.os.fabric.route_to_node()
+        if node is None:
+            return None
+        
+        result = await self.exec_async(node, op, a, b, flags, timeout)
+        if result:
+            return (node, result[0], result[1])
+        return None
+    
+    async def broadcast_exec_async(self, op: int, a: int = 0, b: int = 0,
+                                   flags: int = 0, timeout: int = 200) -> Dict[int, Optional[Tuple[int, int]]]:
+        """
+        Execute operation on all online workers.
+        
+        Returns dict of node_id → (result, extra) or None.
+        """
+        nodes = self.os.fabric.get_online_nodes()
+        futures = [
+            self._track(self.os.submit(node, op, a, b, flags), timeout)
+            for node in nodes
+        ]
+        results = await asyncio.gather(*futures)
+        return dict(zip(nodes, results))
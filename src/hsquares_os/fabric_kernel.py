@@ -12,12 +12,15 @@ Provides global services:
 """
 
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Callable, Any, Tuple
+from typing import Dict, List, Optional, Callable, Any, Tuple, Iterable, Union
 from enum import IntEnum
 import time
 
 from .message import Message, MessageType, ping_msg, exec_msg, compute_msg
 from .node_kernel import NodeKernel, NodeStatus
+from .trace import (
+    TraceBuffer, TraceEntry, TRACE_FULL, merge_tail, query, trace_filter, traced,
+)
 
 
 @dataclass
@@ -43,17 +46,6 @@ class Capability(IntEnum):
     CUSTOM = 0x80       # Custom handlers
 
 
-@dataclass
-class TraceEntry:
-    """Entry in the trace log."""
-    tick: int
-    node_id: int
-    event: str
-    msg_type: Optional[str] = None
-    msg_id: int = 0
-    extra: str = ''
-
-
 class FabricKernel:
     """
     The fabric kernel provides global services for the node network.
@@ -77,9 +69,17 @@ class FabricKernel:
         self.heartbeat_timeout = 1024
         self.last_heartbeat_tick = 0
         
-        # Trace log
-        self.trace_log: List[TraceEntry] = []
-        self.max_trace_entries = 1000
+        # Trace log: the fabric's own events, plus one buffer per
+        # attached node, merged when read
+        self.trace_log = TraceBuffer(capacity=1000)
+        self.trace_buffers: List[TraceBuffer] = [self.trace_log]
+        self._node_traces: Dict[int, TraceBuffer] = {}
+        self.trace_sink: Optional[Callable] = None  # e.g. trace_file.TraceSink
+        
+        # Filter for the fabric's own events (see set_trace)
+        self.trace_level = TRACE_FULL
+        self.trace_only: Optional[frozenset] = None
+        self.trace_nodes: Optional[frozenset] = None
         
         # Pending heartbeats
         self.pending_heartbeats: Dict[int, int] = {}  # msg_id → node_id
@@ -214,7 +214,7 @@ class FabricKernel:
                 if age > self.heartbeat_timeout:
                     # Node timed out
                     self.set_node_status(nid, NodeStatus.OFFLINE)
-                    self.trace(current_tick, nid, 'TIMEOUT')
+                    self._trace(current_tick, nid, 'TIMEOUT')
         
         # Send heartbeats if interval elapsed
         if current_tick - self.last_heartbeat_tick >= self.heartbeat_interval:
@@ -249,7 +249,7 @@ class FabricKernel:
         if entry:
             entry.status = NodeStatus.ERROR
             entry.error_count += 1
-            self.trace(0, node_id, 'QUARANTINE')
+            self._trace(0, node_id, 'QUARANTINE')
     
     # ========== Loader Service ==========
     
@@ -276,39 +276,93 @@ class FabricKernel:
     
     # ========== Tracer Service ==========
     
+    @property
+    def max_trace_entries(self) -> int:
+        """Capacity of each trace buffer."""
+        return self.trace_log.capacity
+    
+    @max_trace_entries.setter
+    def max_trace_entries(self, capacity: int):
+        """Resize every trace buffer, keeping the newest entries that fit."""
+        for buf in self.trace_buffers:
+            buf.resize(capacity)
+    
+    def attach_trace(self, node: NodeKernel) -> TraceBuffer:
+        """
+        Give a node its own trace buffer, read back through get_trace().
+        
+        The node records into it directly (no call into the fabric),
+        so capture stays O(1) and nodes share no trace state.
+        """
+        node.trace_buffer = TraceBuffer(self.max_trace_entries)
+        self.trace_buffers.append(node.trace_buffer)
+        self._node_traces[node.node_id] = node.trace_buffer
+        return node.trace_buffer
+    
+    def set_trace(self, level: Union[str, int] = 'full',
+                  events: Optional[Iterable[str]] = None,
+                  nodes: Optional[Iterable[int]] = None):
+        """
+        Filter the fabric's own trace events (supervisor timeouts,
+        quarantines) by level, event name and node.
+        
+        Node kernels filter their events themselves
+        (NodeKernel.set_trace); trace() records whatever it is given.
+        """
+        self.trace_level, self.trace_only = trace_filter(level, events)
+        self.trace_nodes = None if nodes is None else frozenset(nodes)
+    
+    def _trace(self, tick: int, node_id: int, event: str):
+        """Record one of the fabric's own events, if the filter allows it."""
+        if (traced(event, self.trace_level, self.trace_only)
+                and (self.trace_nodes is None or node_id in self.trace_nodes)):
+            self.trace(tick, node_id, event)
+    
     def trace(self, tick: int, node_id: int, event: str, 
               msg: Optional[Message] = None, extra: str = ''):
-        """Add entry to trace log."""
-        entry = TraceEntry(
-            tick=tick,
-            node_id=node_id,
-            event=event,
-            msg_type=msg.msg_type.name if msg else None,
-            msg_id=msg.msg_id if msg else 0,
-            extra=extra,
-        )
+        """Add entry to the fabric's trace log (O(1), oldest dropped when full)."""
+        self.trace_log.record(tick, node_id, event, msg, extra)
+        if self.trace_sink is not None:
+            self.trace_sink(node_id, tick, event, msg, extra)
+    
+    def get_trace(self, last_n: int = 100) -> List[TraceEntry]:
+        """Get the last_n trace entries across all buffers, by (tick, node)."""
+        return merge_tail(self.trace_buffers, last_n)
+    
+    def dump_trace(self, last_n: Optional[int] = None) -> str:
+        """Dump the merged trace (or its last_n entries) as text."""
+        return "\n".join(str(entry) for entry in merge_tail(self.trace_buffers, last_n))
+    
+    def query_trace(self, node: Union[int, Iterable[int], None] = None,
+                    event: Union[str, Iterable[str], None] = None,
+                    tick_range: Optional[Tuple[int, int]] = None,
+                    msg_id: Optional[int] = None,
+                    limit: Optional[int] = None) -> List[TraceEntry]:
+        """
+        Find trace entries by node, event name(s), tick range and msg_id.
         
-        self.trace_log.append(entry)
+        tick_range is (start, stop), stop exclusive. Only the named
+        nodes' buffers are searched (plus the fabric's own log); within
+        a buffer, ticks are binary-searched and events/msg_ids looked up
+        in its index. Results are ordered by (tick, node).
         
-        # Trim if too long
-        if len(self.trace_log) > self.max_trace_entries:
-            self.trace_log = self.trace_log[-self.max_trace_entries:]
+        Usage:
+            fabric.query_trace(node=5, tick_range=(1000000, 1100000))
+            fabric.query_trace(msg_id=42)
+            fabric.query_trace(event=('OVERFLOW', 'ERROR'))
+        """
+        if node is None:
+            buffers = self.trace_buffers
+        else:
+            ids = (node,) if isinstance(node, int) else tuple(node)
+            buffers = [self.trace_log] + [
+                self._node_traces[nid] for nid in ids if nid in self._node_traces
+            ]
+        return query(buffers, node, event, tick_range, msg_id, limit)
     
-    def get_trace(self, last_n: int = 100) -> List[TraceEntry]:
-        """Get recent trace entries."""
-        return self.trace_log[-last_n:]
-    
-    def dump_trace(self) -> str:
-        """Dump trace log as string."""
-        lines = []
-        for entry in self.trace_log:
-            line = f"[{entry.tick:6d}] Node {entry.node_id}: {entry.event}"
-            if entry.msg_type:
-                line += f" ({entry.msg_type} #{entry.msg_id})"
-            if entry.extra:
-                line += f" - {entry.extra}"
-            lines.append(line)
-        return "\n".join(lines)
+    def trace_entries(self) -> int:
+        """Entries currently held across all trace buffers."""
+        return sum(len(buf) for buf in self.trace_buffers)
     
     # ========== Introspection ==========
     
@@ -338,5 +392,5 @@ class FabricKernel:
             'available_nodes': available,
             'total_messages': total_msgs,
             'total_errors': total_errors,
-            'trace_entries': len(self.trace_log),
+            'trace_entries': self.trace_entries(),
         }
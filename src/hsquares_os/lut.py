@@ -0,0 +1,91 @@
+"""
+OPERATION LOOKUP TABLES
+
+The pure built-in OpCodes (ADD, SUB, CMP, AND, OR, XOR, SHIFT_L/R)
+depend only on their two operand bytes. OpTables precomputes each
+op's (result, extra) over all 65536 operand pairs, indexed by
+(a << 8) | b:
+
+  results, extras   bytes(65536) each - compact, NumPy-viewable
+  pairs             list of (result, extra) tuples for scalar dispatch
+
+One set of tables is built per process and shared by every kernel
+using the 'lut' op backend. evaluate() applies an op to whole arrays
+of operands in one call (vectorized with NumPy when installed), e.g.
+to check a neural processor against ground truth over every input.
+"""
+
+from typing import Callable, Dict, List, Sequence, Tuple
+
+
+class OpTables:
+    """
+    Lookup tables for a set of pure two-byte operations.
+    
+    ops maps opcode → fn(a, b, flags) -> (result, extra); flags must
+    not affect the result.
+    """
+    
+    def __init__(self, ops: Dict[int, Callable]):
+        self.ops = dict(ops)
+        self._tables: Dict[int, Tuple[bytes, bytes, List[Tuple[int, int]]]] = {}
+    
+    def __contains__(self, op: int) -> bool:
+        return op in self.ops
+    
+    def build(self):
+        """Precompute the tables for every op."""
+        for op in self.ops:
+            self.table(op)
+    
+    def table(self, op: int) -> Tuple[bytes, bytes, List[Tuple[int, int]]]:
+        """Get (results, extras, pairs) for op, building them on first use."""
+        tables = self._tables.get(op)
+        if tables is None:
+            fn = self.ops[op]
+            interned: Dict[Tuple[int, int], Tuple[int, int]] = {}
+            pairs = [
+                interned.setdefault(r, r)
+                for r in (fn(a, b, 0) for a in range(256) for b in range(256))
+            ]
+            tables = self._tables[op] = (
+                bytes(r for r, _ in pairs),
+                bytes(e for _, e in pairs),
+                pairs,
+            )
+        return tables
+    
+    def handler(self, op: int) -> Callable:
+        """Op handler that answers from the table instead of computing."""
+        pairs = self.table(op)[2]
+        
+        def lut_handler(a: int, b: int, flags: int) -> Tuple[int, int]:
+            return pairs[((a & 0xFF) << 8) | (b & 0xFF)]
+        
+        return lut_handler
+    
+    def evaluate(self, op: int, a: Sequence[int], b: Sequence[int]):
+        """
+        Apply op to arrays of operands in one call.
+        
+        Returns (results, extras): uint8 arrays if NumPy is installed,
+        bytes otherwise.
+        """
+        results, extras, _ = self.table(op)
+        
+        try:
+            import numpy as np
+        except ImportError:
+            index = [((x & 0xFF) << 8) | (y & 0xFF) for x, y in zip(a, b)]
+            return (
+                bytes(results[i] for i in index),
+                bytes(extras[i] for i in index),
+            )
+        
+        a = np.asarray(a, dtype=np.uint16) & 0xFF
+        b = np.asarray(b, dtype=np.uint16) & 0xFF
+        index = (a << 8) | b
+        return (
+            np.frombuffer(results, dtype=np.uint8)[index],
+            np.frombuffer(extras, dtype=np.uint8)[index],
+        )
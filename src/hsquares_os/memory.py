@@ -0,0 +1,205 @@
+"""
+NODE MEMORY
+
+Sparse, paged 64 KB address space for NodeKernel.
+
+A flat bytearray costs 64 KB per node whether or not it is touched;
+the demos only ever use a few bytes around $0400. PagedMemory splits
+the address space into 256-byte pages. Every page starts out as one
+shared, read-only zero page and gets its own bytearray on the first
+non-zero write, so a fabric's footprint follows its working set.
+
+PagedMemory supports the subset of bytearray that NodeKernel uses:
+len(), integer and slice indexing, and same-length slice assignment.
+
+MemoryArena goes the other way: one contiguous buffer holding every
+node's memory back to back, handed out as zero-copy memoryview rows.
+A whole-fabric snapshot is then a single buffer copy.
+"""
+
+from typing import List, Union
+import mmap
+
+
+PAGE_SIZE = 256
+PAGE_SHIFT = 8
+PAGE_MASK = PAGE_SIZE - 1
+
+# Shared backing for every page never written
+ZERO_PAGE = bytes(PAGE_SIZE)
+
+
+class PagedMemory:
+    """
+    64 KB node memory allocated a page at a time.
+    
+    Usage:
+        mem = PagedMemory()
+        mem[0x0400] = 42
+        mem.pages_allocated    # 1
+        mem.footprint()        # 256
+    """
+    
+    __slots__ = ('size', '_pages', 'pages_allocated')
+    
+    def __init__(self, size: int = 0x10000):
+        if size % PAGE_SIZE:
+            raise ValueError(f"size must be a multiple of {PAGE_SIZE}")
+        self.size = size
+        self._pages: List[Union[bytes, bytearray]] = [ZERO_PAGE] * (size >> PAGE_SHIFT)
+        self.pages_allocated = 0
+    
+    def __len__(self) -> int:
+        return self.size
+    
+    def _page_for_write(self, index: int) -> bytearray:
+        """Get a writable page, allocating it on first write."""
+        page = self._pages[index]
+        if page is ZERO_PAGE:
+            page = self._pages[index] = bytearray(PAGE_SIZE)
+            self.pages_allocated += 1
+        return page
+    
+    def _range(self, key: slice):
+        """Resolve a slice to (start, stop); only step 1 is supported."""
+        start, stop, step = key.indices(self.size)
+        if step != 1:
+            raise ValueError("PagedMemory slices must have step 1")
+        return start, max(start, stop)
+    
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            start, stop = self._range(key)
+            out = bytearray(stop - start)
+            pos = 0
+            while start < stop:
+                offset = start & PAGE_MASK
+                n = min(PAGE_SIZE - offset, stop - start)
+                page = self._pages[start >> PAGE_SHIFT]
+                if page is not ZERO_PAGE:
+                    out[pos:pos + n] = page[offset:offset + n]
+                pos += n
+                start += n
+            return out
+        
+        if key < 0:
+            key += self.size
+        if not 0 <= key < self.size:
+            raise IndexError("memory address out of range")
+        return self._pages[key >> PAGE_SHIFT][key & PAGE_MASK]
+    
+    def __setitem__(self, key, value):
+        if isinstance(key, slice):
+            start, stop = self._range(key)
+            data = memoryview(value).cast('B')
+            if len(data) != stop - start:
+                raise ValueError("PagedMemory slice assignment cannot resize")
+            pos = 0
+            while start < stop:
+                offset = start & PAGE_MASK
+                n = min(PAGE_SIZE - offset, stop - start)
+                index = start >> PAGE_SHIFT
+                chunk = data[pos:pos + n]
+                if self._pages[index] is not ZERO_PAGE or any(chunk):
+                    self._page_for_write(index)[offset:offset + n] = chunk
+                pos += n
+                start += n
+            return
+        
+        if key < 0:
+            key += self.size
+        if not 0 <= key < self.size:
+            raise IndexError("memory address out of range")
+        if not 0 <= value <= 0xFF:
+            raise ValueError("byte must be in range(0, 256)")
+        index = key >> PAGE_SHIFT
+        page = self._pages[index]
+        if page is ZERO_PAGE:
+            if not value:
+                return  # Still zero: keep sharing
+            page = self._page_for_write(index)
+        page[key & PAGE_MASK] = value
+    
+    def __bytes__(self) -> bytes:
+        return bytes(self[:])
+    
+    def clear(self):
+        """Return every page to the shared zero page."""
+        self._pages = [ZERO_PAGE] * (self.size >> PAGE_SHIFT)
+        self.pages_allocated = 0
+    
+    def footprint(self) -> int:
+        """Bytes of page storage actually allocated."""
+        return self.pages_allocated * PAGE_SIZE
+    
+    def __repr__(self) -> str:
+        return (
+            f"PagedMemory({self.pages_allocated}/{len(self._pages)} pages, "
+            f"{self.footprint()} bytes)"
+        )
+
+
+class MemoryArena:
+    """
+    One contiguous buffer backing the memories of many nodes.
+    
+    Row i (node_size bytes) belongs to node i; view(i) is a zero-copy
+    memoryview that NodeKernel uses in place of its own bytearray.
+    With use_mmap the arena is an anonymous mmap instead of a
+    bytearray, so the OS only commits the pages actually touched.
+    
+    Usage:
+        arena = MemoryArena(num_nodes=9)
+        kernel = NodeKernel(node_id=1, memory=arena.view(1))
+        arena.array()[:, 0x0400]   # value at $0400 on every node
+    """
+    
+    def __init__(self, num_nodes: int, node_size: int = 0x10000, use_mmap: bool = False):
+        if num_nodes < 1 or node_size < 1:
+            raise ValueError("arena needs at least one node of non-zero size")
+        self.num_nodes = num_nodes
+        self.node_size = node_size
+        self.use_mmap = use_mmap
+        
+        size = num_nodes * node_size
+        self.buffer = mmap.mmap(-1, size) if use_mmap else bytearray(size)
+        self._view = memoryview(self.buffer)
+    
+    def __len__(self) -> int:
+        return self.num_nodes * self.node_size
+    
+    def view(self, node: int) -> memoryview:
+        """Zero-copy view of one node's memory."""
+        if not 0 <= node < self.num_nodes:
+            raise IndexError(f"node {node} not in arena")
+        start = node * self.node_size
+        return self._view[start:start + self.node_size]
+    
+    def snapshot(self) -> bytes:
+        """Copy of every node's memory, as one buffer."""
+        return bytes(self._view)
+    
+    def restore(self, data: bytes):
+        """Overwrite the whole arena from a snapshot()."""
+        if len(data) != len(self):
+            raise ValueError(f"snapshot is {len(data)} bytes, arena is {len(self)}")
+        self._view[:] = data
+    
+    def array(self):
+        """
+        Zero-copy NumPy view, shape (num_nodes, node_size).
+        
+        Requires NumPy.
+        """
+        import numpy as np
+        return np.frombuffer(self.buffer, dtype=np.uint8).reshape(
+            self.num_nodes, self.node_size
+        )
+    
+    def footprint(self) -> int:
+        """Bytes reserved for the arena."""
+        return len(self)
+    
+    def __repr__(self) -> str:
+        kind = 'mmap' if self.use_mmap else 'bytearray'
+        return f"MemoryArena({self.num_nodes} x {self.node_size} bytes, {kind})"
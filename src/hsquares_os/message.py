@@ -5,17 +5,27 @@ All communication in Hollywood Squares OS is via fixed-size messages.
 
 Frame format (16 bytes):
   $00     msg_type      Message type code
-  $01     msg_id        Sequence number
+  $01     msg_id        Sequence number (low byte)
   $02     src_node      Source node ID
   $03     dst_node      Destination node ID
-  $04     payload_len   Payload length (0-10)
+  $04     payload_len   Payload length (0-10), or msg_id high byte
   $05     flags         Flags
   $06-$0F payload       Message payload (10 bytes)
+
+Message IDs are 16-bit. An ID above 255 is framed with the WIDE_ID
+flag, and byte $04 then carries its high byte instead of payload_len
+(which is always recoverable from the payload itself).
+
+Fragmented payloads (LOAD, DUMP_DATA) travel as a train of frames
+flagged FRAGMENT, the last one also LAST_FRAG:
+  $06-$07 seq           Fragment sequence number (little-endian)
+  $08-$0F data          Up to 8 bytes of stream data
+The stream itself starts with a 16-bit little-endian data length.
 """
 
-from dataclasses import dataclass, field
+from array import array
 from enum import IntEnum, IntFlag
-from typing import List, Optional
+from typing import Iterable, Iterator, List, Optional, Tuple
 import struct
 
 
@@ -45,28 +55,32 @@ class MessageType(IntEnum):
     @property
     def is_request(self) -> bool:
         """Is this a request type (expects response)?"""
-        return self in (
-            MessageType.PING,
-            MessageType.EXEC,
-            MessageType.LOAD,
-            MessageType.DUMP,
-            MessageType.STATUS,
-            MessageType.ROUTE,
-            MessageType.COMPUTE,
-        )
+        return self in _REQUEST_TYPES
     
     @property
     def response_type(self) -> Optional['MessageType']:
         """Get the expected response type for a request."""
-        mapping = {
-            MessageType.PING: MessageType.PONG,
-            MessageType.EXEC: MessageType.EXEC_OK,
-            MessageType.LOAD: MessageType.LOAD_OK,
-            MessageType.DUMP: MessageType.DUMP_DATA,
-            MessageType.STATUS: MessageType.STATUS_RPL,
-            MessageType.COMPUTE: MessageType.COMPUTE_OK,
-        }
-        return mapping.get(self)
+        return _RESPONSE_TYPES.get(self)
+
+
+_REQUEST_TYPES = frozenset((
+    MessageType.PING,
+    MessageType.EXEC,
+    MessageType.LOAD,
+    MessageType.DUMP,
+    MessageType.STATUS,
+    MessageType.ROUTE,
+    MessageType.COMPUTE,
+))
+
+_RESPONSE_TYPES = {
+    MessageType.PING: MessageType.PONG,
+    MessageType.EXEC: MessageType.EXEC_OK,
+    MessageType.LOAD: MessageType.LOAD_OK,
+    MessageType.DUMP: MessageType.DUMP_DATA,
+    MessageType.STATUS: MessageType.STATUS_RPL,
+    MessageType.COMPUTE: MessageType.COMPUTE_OK,
+}
 
 
 class MessageFlags(IntFlag):
@@ -77,9 +91,21 @@ class MessageFlags(IntFlag):
     FRAGMENT = 0x04   # Part of fragmented message
     LAST_FRAG = 0x08  # Last fragment
     BROADCAST = 0x10  # Send to all nodes
+    STREAM_ACK = 0x20 # Fragment stream acknowledgment
+    WIDE_ID = 0x40    # Frame byte $04 holds msg_id bits 8-15 (wire only)
+
+
+# Precompiled frame layout
+FRAME_STRUCT = struct.Struct('BBBBBB10s')
+
+# Largest message ID (16-bit, see WIDE_ID)
+MAX_MSG_ID = 0xFFFF
+
+_WIDE_ID = int(MessageFlags.WIDE_ID)
+
+_ZERO_PAYLOAD = bytes(10)
 
 
-@dataclass
 class Message:
     """
     Fixed-size message frame (16 bytes).
@@ -87,53 +113,82 @@ class Message:
     This is the fundamental communication primitive in Hollywood Squares OS.
     All syscalls, all inter-node communication, all control - everything
     flows through messages.
+    
+    Slotted: the payload is normalized to 10 bytes and its meaningful
+    length computed once, when it is assigned. msg_type and flags are
+    only wrapped in their enums when given as plain ints.
     """
-    msg_type: MessageType
-    msg_id: int = 0
-    src_node: int = 0
-    dst_node: int = 0
-    payload: bytes = field(default_factory=lambda: bytes(10))
-    flags: MessageFlags = MessageFlags.NONE
+    
+    __slots__ = ('msg_type', 'msg_id', 'src_node', 'dst_node',
+                 '_payload', '_payload_len', 'flags', '_pool', '_refs')
     
     # Frame size
     FRAME_SIZE = 16
     PAYLOAD_SIZE = 10
     
-    def __post_init__(self):
-        # Ensure payload is correct size
-        if len(self.payload) > self.PAYLOAD_SIZE:
-            self.payload = self.payload[:self.PAYLOAD_SIZE]
-        elif len(self.payload) < self.PAYLOAD_SIZE:
-            self.payload = self.payload + bytes(self.PAYLOAD_SIZE - len(self.payload))
+    def __init__(self, msg_type: MessageType, msg_id: int = 0,
+                 src_node: int = 0, dst_node: int = 0,
+                 payload: bytes = _ZERO_PAYLOAD,
+                 flags: MessageFlags = MessageFlags.NONE):
+        # Ensure msg_type / flags are enums (plain ints only)
+        if type(msg_type) is not MessageType:
+            msg_type = MessageType(msg_type)
+        if type(flags) is not MessageFlags:
+            flags = MessageFlags(flags)
         
-        # Ensure msg_type is MessageType enum
-        if isinstance(self.msg_type, int):
-            self.msg_type = MessageType(self.msg_type)
+        self.msg_type = msg_type
+        self.msg_id = msg_id
+        self.src_node = src_node
+        self.dst_node = dst_node
+        self.flags = flags
+        self.payload = payload
+        self._pool = None
+        self._refs = 0
+    
+    @property
+    def payload(self) -> bytes:
+        """Payload, always PAYLOAD_SIZE bytes."""
+        return self._payload
+    
+    @payload.setter
+    def payload(self, payload: bytes):
+        # Ensure payload is correct size
+        n = len(payload)
+        if n > self.PAYLOAD_SIZE:
+            payload = payload[:self.PAYLOAD_SIZE]
+        elif n < self.PAYLOAD_SIZE:
+            payload = payload + bytes(self.PAYLOAD_SIZE - n)
+        self._payload = payload
         
-        # Ensure flags is MessageFlags enum
-        if isinstance(self.flags, int):
-            self.flags = MessageFlags(self.flags)
+        # Length of meaningful data: up to last non-zero byte
+        self._payload_len = len(payload.rstrip(b'\x00'))
     
     @property
     def payload_len(self) -> int:
         """Length of meaningful payload data."""
-        # Find last non-zero byte
-        for i in range(len(self.payload) - 1, -1, -1):
-            if self.payload[i] != 0:
-                return i + 1
-        return 0
+        return self._payload_len
     
     def to_bytes(self) -> bytes:
         """Serialize message to 16-byte frame."""
-        return struct.pack(
-            'BBBBBB10s',
+        msg_id = self.msg_id
+        if msg_id > 0xFF:
+            return FRAME_STRUCT.pack(
+                self.msg_type,
+                msg_id & 0xFF,
+                self.src_node & 0xFF,
+                self.dst_node & 0xFF,
+                (msg_id >> 8) & 0xFF,
+                self.flags | _WIDE_ID,
+                self._payload,
+            )
+        return FRAME_STRUCT.pack(
             self.msg_type,
-            self.msg_id & 0xFF,
+            msg_id,
             self.src_node & 0xFF,
             self.dst_node & 0xFF,
-            self.payload_len,
-            int(self.flags),
-            self.payload,
+            self._payload_len,
+            self.flags,
+            self._payload,
         )
     
     @classmethod
@@ -142,9 +197,10 @@ class Message:
         if len(data) < cls.FRAME_SIZE:
             data = data + bytes(cls.FRAME_SIZE - len(data))
         
-        msg_type, msg_id, src, dst, plen, flags, payload = struct.unpack(
-            'BBBBBB10s', data[:cls.FRAME_SIZE]
-        )
+        msg_type, msg_id, src, dst, plen, flags, payload = FRAME_STRUCT.unpack_from(data)
+        if flags & _WIDE_ID:
+            msg_id |= plen << 8
+            flags &= ~_WIDE_ID
         
         return cls(
             msg_type=MessageType(msg_type),
@@ -159,10 +215,8 @@ class Message:
         """Create a response to this message."""
         if error:
             resp_type = MessageType.EXEC_ERR
-        elif self.msg_type.response_type:
-            resp_type = self.msg_type.response_type
         else:
-            resp_type = MessageType.NOP
+            resp_type = _RESPONSE_TYPES.get(self.msg_type, MessageType.NOP)
         
         return Message(
             msg_type=resp_type,
@@ -172,6 +226,30 @@ class Message:
             payload=payload,
         )
     
+    # ========== Pool Ownership ==========
+    
+    def retain(self):
+        """Take a reference to a pooled message (no-op if not pooled)."""
+        if self._pool is not None:
+            self._refs += 1
+    
+    def release(self):
+        """Drop a reference; the last one returns it to its pool."""
+        if self._pool is not None:
+            self._pool.release(self)
+    
+    def _key(self) -> tuple:
+        """Field tuple used for equality."""
+        return (self.msg_type, self.msg_id, self.src_node, self.dst_node,
+                self._payload, self.flags)
+    
+    def __eq__(self, other) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self._key() == other._key()
+    
+    __hash__ = None  # Mutable, like the dataclass it replaces
+    
     def __repr__(self) -> str:
         return (
             f"Message({self.msg_type.name}, "
@@ -181,10 +259,343 @@ class Message:
         )
 
 
+class MessageReleasedError(RuntimeError):
+    """A pooled message was used after being released to its pool."""
+
+
+_GUARDED_FIELDS = frozenset((
+    'msg_type', 'msg_id', 'src_node', 'dst_node', 'payload',
+    'payload_len', 'flags', 'to_bytes', 'response', 'retain',
+))
+
+
+class _ReleasedMessage(Message):
+    """Poisoned message left behind by a debug pool on release."""
+    
+    __slots__ = ()
+    
+    def __getattribute__(self, name):
+        if name in _GUARDED_FIELDS:
+            raise MessageReleasedError(f"use of released message ({name})")
+        return object.__getattribute__(self, name)
+    
+    def __repr__(self) -> str:
+        return "Message(<released>)"
+
+
+class MessagePool:
+    """
+    Freelist of Message objects for the bus hot path.
+    
+    Opt-in: install with set_message_pool(). While a pool is installed
+    the factory functions below draw from it and write payloads into
+    each message's reusable bytearray instead of building new bytes.
+    
+    Ownership is reference counted. A message leaves the pool with one
+    reference, held by whoever is transporting it; the node that
+    consumes it releases that reference after dispatch. Anything that
+    keeps a message longer (e.g. a RequestHandle) calls retain() and
+    later release(). The last release puts it back on the freelist.
+    
+    In debug mode released messages are never reused; instead they are
+    poisoned so that any later field access raises MessageReleasedError.
+    """
+    
+    def __init__(self, max_free: int = 1024, debug: bool = False):
+        self.max_free = max_free
+        self.debug = debug
+        self._free: List[Message] = []
+        
+        # Statistics
+        self.allocated = 0
+        self.reused = 0
+        self.released = 0
+    
+    def acquire(self, msg_type: MessageType, msg_id: int, src: int, dst: int,
+                data, flags: MessageFlags = MessageFlags.NONE) -> Message:
+        """Get a message from the freelist (or allocate one) and fill it."""
+        free = self._free
+        if free:
+            msg = free.pop()
+            self.reused += 1
+            msg.msg_type = msg_type
+            msg.msg_id = msg_id
+            msg.src_node = src
+            msg.dst_node = dst
+            msg.flags = flags
+        else:
+            msg = Message(msg_type, msg_id, src, dst, _ZERO_PAYLOAD, flags)
+            msg._pool = self
+            self.allocated += 1
+        
+        buf = msg._payload
+        if type(buf) is not bytearray:
+            buf = msg._payload = bytearray(Message.PAYLOAD_SIZE)
+        n = len(data)
+        buf[:n] = data
+        buf[n:] = _ZERO_PAYLOAD[n:]
+        
+        # Length of meaningful data: up to last non-zero byte
+        while n and not buf[n - 1]:
+            n -= 1
+        msg._payload_len = n
+        msg._refs = 1
+        return msg
+    
+    def release(self, msg: Message):
+        """Drop one reference to msg; recycle it when none remain."""
+        if msg._refs <= 0:
+            raise MessageReleasedError("message released twice")
+        msg._refs -= 1
+        if msg._refs:
+            return
+        
+        self.released += 1
+        if self.debug:
+            msg.__class__ = _ReleasedMessage
+        elif len(self._free) < self.max_free:
+            self._free.append(msg)
+    
+    def get_stats(self) -> dict:
+        """Get pool statistics."""
+        return {
+            'allocated': self.allocated,
+            'reused': self.reused,
+            'released': self.released,
+            'free': len(self._free),
+        }
+
+
+# Pool used by the factory functions (None: plain allocation)
+_pool: Optional[MessagePool] = None
+
+
+def set_message_pool(pool: Optional[MessagePool]) -> Optional[MessagePool]:
+    """Install (or with None, remove) the message pool. Returns the old one."""
+    global _pool
+    old, _pool = _pool, pool
+    return old
+
+
+def get_message_pool() -> Optional[MessagePool]:
+    """Get the installed message pool, if any."""
+    return _pool
+
+
+# Bulk frame codec
+#
+# Batches of messages packed back to back as 16-byte frames in one
+# contiguous buffer, for recording, replay and out-of-process transport.
+
+def encode_frames(messages: Iterable[Message]) -> bytearray:
+    """Pack messages into one contiguous buffer of 16-byte frames."""
+    messages = list(messages)
+    size = FRAME_STRUCT.size
+    buf = bytearray(size * len(messages))
+    pack_into = FRAME_STRUCT.pack_into
+    offset = 0
+    for msg in messages:
+        msg_id = msg.msg_id
+        if msg_id > 0xFF:
+            plen = (msg_id >> 8) & 0xFF
+            flags = msg.flags | _WIDE_ID
+        else:
+            plen = msg._payload_len
+            flags = msg.flags
+        pack_into(
+            buf, offset,
+            msg.msg_type,
+            msg_id & 0xFF,
+            msg.src_node & 0xFF,
+            msg.dst_node & 0xFF,
+            plen,
+            flags,
+            msg._payload,
+        )
+        offset += size
+    return buf
+
+
+def iter_frames(data) -> Iterator[Message]:
+    """Iterate over the messages in a buffer of 16-byte frames."""
+    if len(data) % Message.FRAME_SIZE:
+        raise ValueError(
+            f"buffer length {len(data)} is not a multiple of {Message.FRAME_SIZE}"
+        )
+    
+    for msg_type, msg_id, src, dst, plen, flags, payload in FRAME_STRUCT.iter_unpack(data):
+        if flags & _WIDE_ID:
+            msg_id |= plen << 8
+            flags &= ~_WIDE_ID
+        yield Message(
+            msg_type=MessageType(msg_type),
+            msg_id=msg_id,
+            src_node=src,
+            dst_node=dst,
+            payload=payload,
+            flags=MessageFlags(flags),
+        )
+
+
+def decode_frames(data) -> List[Message]:
+    """Unpack a buffer of 16-byte frames into messages."""
+    return list(iter_frames(data))
+
+
+def frame_dtype():
+    """
+    NumPy structured dtype matching the 16-byte frame layout.
+    
+    'len' holds the msg_id high byte on frames flagged WIDE_ID.
+    Requires NumPy.
+    """
+    import numpy as np
+    return np.dtype([
+        ('msg_type', 'u1'),
+        ('msg_id', 'u1'),
+        ('src', 'u1'),
+        ('dst', 'u1'),
+        ('len', 'u1'),
+        ('flags', 'u1'),
+        ('payload', 'u1', (Message.PAYLOAD_SIZE,)),
+    ])
+
+
+def frames_array(data):
+    """
+    Zero-copy NumPy view of a buffer of 16-byte frames.
+    
+    Whole message logs can be filtered without building Message
+    objects, e.g. log[log['msg_type'] == MessageType.EXEC_OK].
+    Requires NumPy.
+    """
+    import numpy as np
+    return np.frombuffer(data, dtype=frame_dtype())
+
+
+class MessageLog:
+    """
+    Compact log of bus deliveries: (tick, source, destination, frame).
+    
+    Stored column-wise, 28 bytes per delivery: ticks in an array('q'),
+    source and destination node IDs in array('H') columns (frames
+    only carry their low 8 bits), and the 16-byte frames back to back
+    in one bytearray, so `frames` works with iter_frames() and
+    frames_array(). A broadcast is logged once per recipient.
+    
+    Usage:
+        log = MessageLog()
+        log.append(tick, dst, msg)
+        for tick, dst, frame in log: ...
+        log.save('run.hsm'); log = MessageLog.load('run.hsm')
+    """
+    
+    MAGIC = b'HSQMLOG2'
+    
+    def __init__(self):
+        self.ticks = array('q')
+        self.srcs = array('H')
+        self.dsts = array('H')
+        self.frames = bytearray()
+    
+    def __len__(self) -> int:
+        return len(self.dsts)
+    
+    def append(self, tick: int, dst: int, msg: 'Message'):
+        """Record one delivery."""
+        self.ticks.append(tick)
+        self.srcs.append(msg.src_node)
+        self.dsts.append(dst)
+        self.frames += msg.to_bytes()
+    
+    def __iter__(self) -> Iterator[Tuple[int, int, bytes]]:
+        """Iterate (tick, dst, frame) in delivery order."""
+        frames = memoryview(self.frames)
+        size = Message.FRAME_SIZE
+        for i, (tick, dst) in enumerate(zip(self.ticks, self.dsts)):
+            yield tick, dst, bytes(frames[i * size:(i + 1) * size])
+    
+    def message(self, index: int) -> 'Message':
+        """Decode one delivery, with full-width node IDs."""
+        size = Message.FRAME_SIZE
+        msg = Message.from_bytes(self.frames[index * size:(index + 1) * size])
+        msg.src_node = self.srcs[index]
+        if not msg.flags & MessageFlags.BROADCAST:
+            msg.dst_node = self.dsts[index]
+        return msg
+    
+    def __getitem__(self, index: int) -> Tuple[int, int, 'Message']:
+        """(tick, dst, message) of one delivery."""
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("message log index out of range")
+        return self.ticks[index], self.dsts[index], self.message(index)
+    
+    def clear(self):
+        """Forget every delivery."""
+        self.ticks = array('q')
+        self.srcs = array('H')
+        self.dsts = array('H')
+        self.frames = bytearray()
+    
+    def copy(self) -> 'MessageLog':
+        """Independent copy of the log."""
+        log = MessageLog()
+        log.ticks = array('q', self.ticks)
+        log.srcs = array('H', self.srcs)
+        log.dsts = array('H', self.dsts)
+        log.frames = bytearray(self.frames)
+        return log
+    
+    @classmethod
+    def from_messages(cls, messages: Iterable['Message']) -> 'MessageLog':
+        """Log of plain messages, one per tick from tick 1, to their dst_node."""
+        log = cls()
+        for tick, msg in enumerate(messages, 1):
+            log.append(tick, msg.dst_node, msg)
+        return log
+    
+    def save(self, path: str):
+        """Write the log to a file."""
+        with open(path, 'wb') as f:
+            f.write(self.MAGIC + struct.pack('<Q', len(self)))
+            f.write(self.ticks.tobytes())
+            f.write(self.srcs.tobytes())
+            f.write(self.dsts.tobytes())
+            f.write(self.frames)
+    
+    @classmethod
+    def load(cls, path: str) -> 'MessageLog':
+        """Read a log written by save()."""
+        with open(path, 'rb') as f:
+            data = f.read()
+        if data[:8] != cls.MAGIC:
+            raise ValueError(f"{path}: not a message log")
+        count, = struct.unpack_from('<Q', data, 8)
+        if len(data) != 16 + (12 + Message.FRAME_SIZE) * count:
+            raise ValueError(f"{path}: truncated message log")
+        log = cls()
+        offset = 16
+        log.ticks.frombytes(data[offset:offset + 8 * count])
+        offset += 8 * count
+        log.srcs.frombytes(data[offset:offset + 2 * count])
+        offset += 2 * count
+        log.dsts.frombytes(data[offset:offset + 2 * count])
+        offset += 2 * count
+        log.frames = bytearray(data[offset:])
+        return log
+    
+    def __repr__(self) -> str:
+        return f"MessageLog({len(self)} deliveries, {len(self.frames) + 12 * len(self)} bytes)"
+
+
 # Factory functions for common messages
 
 def ping_msg(src: int, dst: int, msg_id: int = 0) -> Message:
     """Create a PING message."""
+    if _pool is not None:
+        return _pool.acquire(MessageType.PING, msg_id, src, dst, (), MessageFlags.ACK_REQ)
     return Message(
         msg_type=MessageType.PING,
         msg_id=msg_id,
@@ -196,6 +607,8 @@ def ping_msg(src: int, dst: int, msg_id: int = 0) -> Message:
 
 def pong_msg(src: int, dst: int, msg_id: int, status: int, load: int) -> Message:
     """Create a PONG response."""
+    if _pool is not None:
+        return _pool.acquire(MessageType.PONG, msg_id, src, dst, (status, load))
     return Message(
         msg_type=MessageType.PONG,
         msg_id=msg_id,
@@ -207,6 +620,9 @@ def pong_msg(src: int, dst: int, msg_id: int, status: int, load: int) -> Message
 
 def exec_msg(src: int, dst: int, msg_id: int, handler_id: int, *args: int) -> Message:
     """Create an EXEC message."""
+    if _pool is not None:
+        return _pool.acquire(MessageType.EXEC, msg_id, src, dst,
+                             (handler_id,) + args[:9], MessageFlags.ACK_REQ)
     payload = bytes([handler_id] + list(args)[:9])
     return Message(
         msg_type=MessageType.EXEC,
@@ -220,6 +636,8 @@ def exec_msg(src: int, dst: int, msg_id: int, handler_id: int, *args: int) -> Me
 
 def exec_ok_msg(src: int, dst: int, msg_id: int, *results: int) -> Message:
     """Create an EXEC_OK response."""
+    if _pool is not None:
+        return _pool.acquire(MessageType.EXEC_OK, msg_id, src, dst, results[:10])
     return Message(
         msg_type=MessageType.EXEC_OK,
         msg_id=msg_id,
@@ -231,6 +649,9 @@ def exec_ok_msg(src: int, dst: int, msg_id: int, *results: int) -> Message:
 
 def compute_msg(src: int, dst: int, msg_id: int, op: int, a: int, b: int, flags: int = 0) -> Message:
     """Create a COMPUTE message for neural operations."""
+    if _pool is not None:
+        return _pool.acquire(MessageType.COMPUTE, msg_id, src, dst,
+                             (op, a, b, flags), MessageFlags.ACK_REQ)
     return Message(
         msg_type=MessageType.COMPUTE,
         msg_id=msg_id,
@@ -243,10 +664,12 @@ def compute_msg(src: int, dst: int, msg_id: int, op: int, a: int, b: int, flags:
 
 def trace_msg(src: int, event_type: int, *data: int) -> Message:
     """Create a TRACE message (fire-and-forget)."""
+    if _pool is not None:
+        return _pool.acquire(MessageType.TRACE, 0, src, 0, (event_type,) + data[:9])
     return Message(
         msg_type=MessageType.TRACE,
         msg_id=0,
         src_node=src,
         dst_node=0,  # Always to master
         payload=bytes([event_type] + list(data)[:9]),
-    )
+    )
\ No newline at end of file
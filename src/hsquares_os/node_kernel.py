@@ -16,12 +16,16 @@ The main loop is an interrupt-less event loop:
 """
 
 from dataclasses import dataclass, field
-from typing import Dict, List, Callable, Optional, Any, Tuple
+from typing import Dict, List, Callable, Optional, Any, Tuple, Iterable, Union
 from enum import IntEnum
 from collections import deque
+import struct
 import time
 
-from .message import Message, MessageType, MessageFlags, pong_msg, exec_ok_msg
+from .message import Message, MessageType, MessageFlags, MAX_MSG_ID, pong_msg, exec_ok_msg
+from .lut import OpTables
+from .timers import Timer, TimerWheel
+from .trace import TRACE_FULL, TraceBuffer, trace_filter, traced
 
 
 class NodeStatus(IntEnum):
@@ -33,6 +37,29 @@ class NodeStatus(IntEnum):
     HALTED = 0x04
 
 
+# Stream bytes carried per fragment (after the 2-byte sequence number)
+FRAG_DATA_SIZE = Message.PAYLOAD_SIZE - 2
+
+# Longest stream send_stream() accepts (its length travels in 16 bits)
+MAX_STREAM_BYTES = 0xFFFF
+
+
+@dataclass
+class TxStream:
+    """Outgoing fragment stream."""
+    msg_type: MessageType
+    dst: int
+    msg_id: int
+    data: bytes
+    sent: int = 0     # Frames sent
+    acked: int = 0    # Frames acknowledged by the receiver
+    
+    @property
+    def num_frames(self) -> int:
+        """Frames needed for the whole stream."""
+        return max(1, -(-len(self.data) // FRAG_DATA_SIZE))
+
+
 class OpCode(IntEnum):
     """Built-in operation codes for EXEC messages."""
     NOP = 0x00
@@ -59,6 +86,148 @@ class OpCode(IntEnum):
     CUSTOM = 0x80       # Custom handler (ID in next byte)
 
 
+# Built-in operations: pure functions of (a, b); flags are ignored
+BUILTIN_OPS: Dict[int, Callable] = {
+    OpCode.NOP: lambda a, b, f: (0, 0),
+    OpCode.ADD: lambda a, b, f: ((a + b) & 0xFF, int((a + b) > 255)),
+    OpCode.SUB: lambda a, b, f: ((a - b) & 0xFF, int(a < b)),
+    OpCode.CMP: lambda a, b, f: (int(a == b), int(a < b) | (int(a > b) << 1)),
+    OpCode.AND: lambda a, b, f: (a & b, 0),
+    OpCode.OR: lambda a, b, f: (a | b, 0),
+    OpCode.XOR: lambda a, b, f: (a ^ b, 0),
+    OpCode.SHIFT_L: lambda a, b, f: ((a << 1) & 0xFF, (a >> 7) & 1),
+    OpCode.SHIFT_R: lambda a, b, f: (a >> 1, a & 1),
+}
+
+# Lookup tables for BUILTIN_OPS, shared by all 'lut' kernels
+_builtin_tables: Optional[OpTables] = None
+
+
+def builtin_op_tables() -> OpTables:
+    """Get the shared BUILTIN_OPS lookup tables, building them on first use."""
+    global _builtin_tables
+    if _builtin_tables is None:
+        _builtin_tables = OpTables(BUILTIN_OPS)
+        _builtin_tables.build()
+    return _builtin_tables
+
+
+class DispatchTable(dict):
+    """
+    Handler dict for one-byte keys, mirrored into a 256-entry list.
+    
+    Registration keeps working through the usual dict operations;
+    dispatch indexes `table` directly instead of hashing the key.
+    """
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__()
+        self.table: List[Optional[Callable]] = [None] * 256
+        self.update(*args, **kwargs)
+    
+    def __setitem__(self, key: int, handler: Callable):
+        if not 0 <= key <= 0xFF:
+            raise ValueError(f"dispatch key out of range: {key}")
+        super().__setitem__(key, handler)
+        self.table[key] = handler
+    
+    def __delitem__(self, key: int):
+        super().__delitem__(key)
+        self.table[key] = None
+    
+    def update(self, *args, **kwargs):
+        for key, handler in dict(*args, **kwargs).items():
+            self[key] = handler
+    
+    def setdefault(self, key: int, default: Callable = None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+    
+    def pop(self, key: int, *default):
+        if key in self:
+            self.table[key] = None
+        return super().pop(key, *default)
+    
+    def popitem(self):
+        key, handler = super().popitem()
+        self.table[key] = None
+        return key, handler
+    
+    def clear(self):
+        super().clear()
+        self.table = [None] * 256
+
+
+class Pending:
+    """
+    Token returned by a split-phase handler instead of (result, extra).
+    
+    The node answers the request when the token completes and keeps
+    processing other messages meanwhile. Complete it with complete()
+    or fail() from anywhere - including another thread, e.g. a thread
+    pool callback (see from_future) - and the node sends EXEC_OK (or
+    COMPUTE_OK) / EXEC_ERR on its next step. Pending.after(ticks, fn)
+    completes with fn() that many node ticks later.
+    
+    Usage:
+        def slow_op(a, b, flags):
+            return Pending.from_future(pool.submit(model, a, b))
+        kernel.register_handler(0x40, slow_op)
+    """
+    
+    __slots__ = ('done', 'value', 'error_code', 'ticks', 'fn',
+                 '_kernel', '_msg_id', '_dst', '_resp_type', '_answered')
+    
+    def __init__(self, ticks: Optional[int] = None, fn: Optional[Callable] = None):
+        self.done = False
+        self.value: Tuple[int, int] = (0, 0)
+        self.error_code = 0
+        self.ticks = ticks
+        self.fn = fn
+        self._kernel = None
+        self._answered = False
+    
+    @classmethod
+    def after(cls, ticks: int, fn: Callable[[], Tuple[int, int]]) -> 'Pending':
+        """Token that completes with fn() after `ticks` node ticks."""
+        return cls(ticks=ticks, fn=fn)
+    
+    @classmethod
+    def from_future(cls, future) -> 'Pending':
+        """Token completed by a concurrent.futures.Future's (result, extra)."""
+        token = cls()
+        
+        def on_done(f):
+            if f.cancelled() or f.exception() is not None:
+                token.fail()
+            else:
+                token.complete(*f.result())
+        
+        future.add_done_callback(on_done)
+        return token
+    
+    def complete(self, result: int, extra: int = 0):
+        """Resolve with (result, extra)."""
+        self.value = (result, extra)
+        self._finish()
+    
+    def fail(self, error_code: int = 0x02):
+        """Resolve with an EXEC_ERR carrying error_code."""
+        self.error_code = error_code
+        self._finish()
+    
+    def _finish(self):
+        self.done = True
+        kernel = self._kernel
+        if kernel is not None:
+            kernel._split_done.append(self)
+
+
+# EXEC / COMPUTE operands: op, a, b, flags (payload is always 10 bytes)
+_unpack_operands = struct.Struct('BBBB').unpack_from
+
+
 @dataclass
 class NodeKernel:
     """
@@ -77,7 +246,8 @@ class NodeKernel:
     tick: int = 0
     error_code: int = 0
     
-    # Memory (simulated 64KB)
+    # Memory (simulated 64KB): a bytearray, or any object indexing
+    # like one (e.g. memory.PagedMemory, a MemoryArena view)
     memory: bytearray = field(default_factory=lambda: bytearray(65536))
     
     # Message queues
@@ -87,23 +257,102 @@ class NodeKernel:
     # Pending responses (msg_id → callback)
     pending: Dict[int, Callable] = field(default_factory=dict)
     
+    # Default ticks before an unanswered send_request() expires
+    # (None: wait forever)
+    request_timeout: Optional[int] = None
+    
+    # Further in-flight request IDs owned by this node (e.g. the OS
+    # request table on the master); never reused while present
+    reserved_ids: Any = ()
+    
     # Handler table (opcode → handler function)
-    handlers: Dict[int, Callable] = field(default_factory=dict)
+    handlers: Dict[int, Callable] = field(default_factory=DispatchTable)
     
     # Statistics
     msgs_received: int = 0
     msgs_sent: int = 0
     errors: int = 0
+    send_blocked: int = 0  # Sends that found the outbox full
+    requests_expired: int = 0
+    requests_cancelled: int = 0
     
     # Neural processor reference (optional)
     neural_processor: Any = None
     
-    # Trace callback (optional)
+    # COMPUTE batching (processors with compute_batch): flush after
+    # compute_max_batch requests, or compute_max_wait ticks after the
+    # first one arrived; 1 disables batching
+    compute_max_batch: int = 1
+    compute_max_wait: int = 0
+    
+    # Trace ring buffer and/or callback (optional), and the filter
+    # applied before recording (see set_trace)
+    trace_buffer: Optional[TraceBuffer] = None
     trace_callback: Optional[Callable] = None
+    trace_level: int = TRACE_FULL
+    trace_only: Optional[frozenset] = None
+    
+    # Scheduler ready set (optional): node_id is added whenever a
+    # message is queued in the inbox or outbox
+    ready_set: Optional[set] = None
+    
+    # System clock (optional): current tick, for nodes whose own tick
+    # is only brought up to date when they are stepped
+    clock: Optional[Callable[[], int]] = None
+    
+    # Processing budget: cost units granted per tick. A message costs
+    # msg_costs.get(msg_type, 1); unspent credit carries over while
+    # the inbox is non-empty (deficit round robin)
+    quantum: int = 1
+    msg_costs: Dict[int, int] = field(default_factory=dict)
+    
+    # Built-in op backend: 'python' computes, 'lut' reads the shared
+    # precomputed tables (see lut.OpTables)
+    op_backend: str = 'python'
+    
+    OP_BACKENDS = ('python', 'lut')
+    
+    # Fragment streams: max unacknowledged frames per outgoing stream
+    frag_window: int = 4
     
     def __post_init__(self):
         """Initialize kernel."""
+        if self.op_backend not in self.OP_BACKENDS:
+            raise ValueError(f"unknown op backend: {self.op_backend}")
+        if not isinstance(self.handlers, DispatchTable):
+            self.handlers = DispatchTable(self.handlers)
         self._register_builtin_handlers()
+        
+        # Outgoing streams: (dst, msg_id) → TxStream
+        self._tx_streams: Dict[Tuple[int, int], TxStream] = {}
+        # Reassembly buffers: (src, msg_id) → [next_seq, bytearray]
+        self._rx_streams: Dict[Tuple[int, int], list] = {}
+        
+        # Unspent processing credit
+        self._credit = 0
+        
+        # Sends waiting for outbox room (the outbox never evicts)
+        self.backlog: deque = deque()
+        
+        # Queued COMPUTE requests: (msg_id, src, op, a, b, flags)
+        self._compute_batch: List[Tuple[int, int, int, int, int, int]] = []
+        self._compute_batch_tick = 0
+        self.compute_batches = 0
+        
+        # Split-phase requests: count, and completed tokens (appended
+        # from any thread)
+        self._split_outstanding = 0
+        self._split_done: deque = deque()
+        
+        # Per-message events, checked inline on the hot path
+        self._trace_send = traced('SEND', self.trace_level, self.trace_only)
+        self._trace_recv = traced('RECV', self.trace_level, self.trace_only)
+        
+        # Timer service
+        self.timers = TimerWheel()
+        
+        # Request deadlines: msg_id → (timer, on_timeout)
+        self._deadlines: Dict[int, Tuple[Timer, Optional[Callable]]] = {}
     
     def _register_builtin_handlers(self):
         """Register built-in message handlers."""
@@ -118,27 +367,37 @@ class NodeKernel:
         self.handlers[MessageType.HALT] = self._handle_halt
         self.handlers[MessageType.COMPUTE] = self._handle_compute
         self.handlers[MessageType.COMPUTE_OK] = self._handle_response
+        self.handlers[MessageType.LOAD] = self._handle_load
+        self.handlers[MessageType.LOAD_OK] = self._handle_response
+        self.handlers[MessageType.DUMP] = self._handle_dump
+        self.handlers[MessageType.DUMP_DATA] = self._handle_dump_data
         
         # Operation handlers
-        self._op_handlers = {
-            OpCode.NOP: lambda a, b, f: (0, 0),
-            OpCode.ADD: lambda a, b, f: ((a + b) & 0xFF, int((a + b) > 255)),
-            OpCode.SUB: lambda a, b, f: ((a - b) & 0xFF, int(a < b)),
-            OpCode.CMP: lambda a, b, f: (int(a == b), int(a < b) | (int(a > b) << 1)),
-            OpCode.AND: lambda a, b, f: (a & b, 0),
-            OpCode.OR: lambda a, b, f: (a | b, 0),
-            OpCode.XOR: lambda a, b, f: (a ^ b, 0),
-            OpCode.SHIFT_L: lambda a, b, f: ((a << 1) & 0xFF, (a >> 7) & 1),
-            OpCode.SHIFT_R: lambda a, b, f: (a >> 1, a & 1),
-        }
+        if self.op_backend == 'lut':
+            tables = builtin_op_tables()
+            self._op_handlers = DispatchTable({op: tables.handler(op) for op in BUILTIN_OPS})
+        else:
+            self._op_handlers = DispatchTable(BUILTIN_OPS)
     
     def register_handler(self, opcode: int, handler: Callable):
         """Register a custom operation handler."""
         self._op_handlers[opcode] = handler
     
-    def set_neural_processor(self, processor):
-        """Set the neural processor for COMPUTE operations."""
+    def set_neural_processor(self, processor, max_batch: int = 1, max_wait: int = 0):
+        """
+        Set the neural processor for COMPUTE operations.
+        
+        With max_batch > 1 and a processor providing
+        compute_batch(ops, as_, bs, flags), COMPUTE requests are queued
+        and evaluated together: when max_batch are waiting, or max_wait
+        ticks after the first was queued (0: at the end of its tick).
+        """
+        if max_batch < 1 or max_wait < 0:
+            raise ValueError("max_batch must be >= 1 and max_wait >= 0")
+        self._flush_compute_batch()
         self.neural_processor = processor
+        self.compute_max_batch = max_batch
+        self.compute_max_wait = max_wait
     
     # ========== Message Handling ==========
     
@@ -147,22 +406,49 @@ class NodeKernel:
         if len(self.inbox) < self.inbox.maxlen:
             self.inbox.append(msg)
             self.msgs_received += 1
-            self._trace('RECV', msg)
+            if self.ready_set is not None:
+                self.ready_set.add(self.node_id)
+            if self._trace_recv:
+                self._trace('RECV', msg)
         else:
             self.errors += 1
             self._trace('OVERFLOW', msg)
+            msg.release()
     
-    def send_message(self, msg: Message):
-        """Queue a message for sending."""
+    def send_message(self, msg: Message) -> bool:
+        """
+        Queue a message for sending.
+        
+        Returns False if the send would block: the outbox is full, so
+        the message waits in the backlog and moves up as the bus
+        drains the outbox. Nothing is ever evicted.
+        """
         msg.src_node = self.node_id
-        self.outbox.append(msg)
         self.msgs_sent += 1
-        self._trace('SEND', msg)
+        if self.ready_set is not None:
+            self.ready_set.add(self.node_id)
+        if self._trace_send:
+            self._trace('SEND', msg)
+        
+        if self.backlog or len(self.outbox) >= self.outbox.maxlen:
+            self.backlog.append(msg)
+            self.send_blocked += 1
+            return False
+        self.outbox.append(msg)
+        return True
+    
+    @property
+    def would_block(self) -> bool:
+        """Would the next send_message() have to wait for outbox room?"""
+        return len(self.outbox) >= self.outbox.maxlen
     
     def get_outgoing(self) -> Optional[Message]:
         """Get next message to send (called by bus)."""
         if self.outbox:
-            return self.outbox.popleft()
+            msg = self.outbox.popleft()
+            if self.backlog:
+                self.outbox.append(self.backlog.popleft())
+            return msg
         return None
     
     def has_pending_messages(self) -> bool:
@@ -171,21 +457,87 @@ class NodeKernel:
     
     # ========== Main Loop ==========
     
-    def step(self) -> bool:
+    def step(self) -> int:
         """
         Execute one kernel step.
         
-        Returns True if work was done, False if idle.
+        Processes inbox messages in arrival order while the tick's
+        credit covers their cost. Returns the number of messages
+        processed (0 if idle).
         """
         self.tick += 1
         
         # Check inbox
-        if self.inbox:
-            msg = self.inbox.popleft()
-            self._dispatch(msg)
-            return True
+        inbox = self.inbox
+        processed = 0
+        if inbox:
+            credit = self._credit + self.quantum
+            costs = self.msg_costs
+            while inbox:
+                cost = costs.get(inbox[0].msg_type, 1) if costs else 1
+                if cost > credit:
+                    break
+                credit -= cost
+                msg = inbox.popleft()
+                self._dispatch(msg)
+                if msg._pool is not None:
+                    msg._pool.release(msg)  # Consumed
+                processed += 1
+            self._credit = credit if inbox else 0
+        else:
+            self._credit = 0
         
-        return False
+        # Deferred work
+        if self.timers.active:
+            self.timers.advance(self.tick)
+        if self._compute_batch:
+            self._poll_compute_batch()
+        if self._split_outstanding:
+            self._poll_split()
+        return processed
+    
+    def is_idle(self) -> bool:
+        """Nothing queued and no deferred work: stepping would be a no-op."""
+        return (
+            not self.inbox
+            and not self.outbox
+            and not self._compute_batch
+            and not self._split_outstanding
+            and not self.timers.active
+        )
+    
+    # ========== Timers ==========
+    
+    def schedule(self, after_ticks: int, callback: Callable, *args) -> Timer:
+        """
+        Call callback(*args) after_ticks node ticks from now.
+        
+        Timers fire during step(); a node with armed timers is never
+        idle, so the ready scheduler steps it every tick.
+        """
+        self.timers.advance(self._clock_now())
+        timer = self.timers.schedule(after_ticks, callback, *args)
+        if self.ready_set is not None:
+            self.ready_set.add(self.node_id)
+        return timer
+    
+    def schedule_every(self, period: int, callback: Callable, *args) -> Timer:
+        """Call callback(*args) every `period` node ticks until cancelled."""
+        self.timers.advance(self._clock_now())
+        timer = self.timers.schedule_every(period, callback, *args)
+        if self.ready_set is not None:
+            self.ready_set.add(self.node_id)
+        return timer
+    
+    def cancel_timer(self, timer: Timer) -> bool:
+        """Cancel a timer. Returns False if it already fired."""
+        return self.timers.cancel(timer)
+    
+    def _clock_now(self) -> int:
+        """Current tick, even if this node has not been stepped lately."""
+        if self.clock is None:
+            return self.tick
+        return max(self.tick, self.clock())
     
     def run(self, max_ticks: int = 1000) -> int:
         """
@@ -197,13 +549,12 @@ class NodeKernel:
         for _ in range(max_ticks):
             if self.status == NodeStatus.HALTED:
                 break
-            if self.step():
-                processed += 1
+            processed += self.step()
         return processed
     
     def _dispatch(self, msg: Message):
         """Dispatch message to appropriate handler."""
-        handler = self.handlers.get(msg.msg_type)
+        handler = self.handlers.table[msg.msg_type]
         
         if handler:
             try:
@@ -239,17 +590,17 @@ class NodeKernel:
     
     def _handle_exec(self, msg: Message):
         """Handle EXEC - execute operation and respond."""
-        payload = msg.payload
-        opcode = payload[0] if len(payload) > 0 else 0
-        a = payload[1] if len(payload) > 1 else 0
-        b = payload[2] if len(payload) > 2 else 0
-        flags = payload[3] if len(payload) > 3 else 0
+        opcode, a, b, flags = _unpack_operands(msg._payload)
         
         # Find handler
-        handler = self._op_handlers.get(opcode)
+        handler = self._op_handlers.table[opcode]
         
         if handler:
-            result, extra = handler(a, b, flags)
+            out = handler(a, b, flags)
+            if type(out) is Pending:
+                self._defer(out, msg, MessageType.EXEC_OK)
+                return
+            result, extra = out
             response = exec_ok_msg(
                 self.node_id,
                 msg.src_node,
@@ -270,16 +621,25 @@ class NodeKernel:
     
     def _handle_compute(self, msg: Message):
         """Handle COMPUTE - neural operation."""
-        payload = msg.payload
-        op = payload[0] if len(payload) > 0 else 0
-        a = payload[1] if len(payload) > 1 else 0
-        b = payload[2] if len(payload) > 2 else 0
-        flags = payload[3] if len(payload) > 3 else 0
+        op, a, b, flags = _unpack_operands(msg._payload)
+        
+        if self.compute_max_batch > 1 and hasattr(self.neural_processor, 'compute_batch'):
+            # Queue for the next batch
+            if not self._compute_batch:
+                self._compute_batch_tick = self.tick
+            self._compute_batch.append((msg.msg_id, msg.src_node, op, a, b, flags))
+            if len(self._compute_batch) >= self.compute_max_batch:
+                self._flush_compute_batch()
+            return
         
         if self.neural_processor:
             # Use neural processor
             try:
-                result, out_flags = self.neural_processor.compute(op, a, b, flags)
+                out = self.neural_processor.compute(op, a, b, flags)
+                if type(out) is Pending:
+                    self._defer(out, msg, MessageType.COMPUTE_OK)
+                    return
+                result, out_flags = out
                 response = Message(
                     msg_type=MessageType.COMPUTE_OK,
                     msg_id=msg.msg_id,
@@ -297,9 +657,13 @@ class NodeKernel:
                 )
         else:
             # Fallback to standard ops
-            handler = self._op_handlers.get(op)
+            handler = self._op_handlers.table[op]
             if handler:
-                result, extra = handler(a, b, flags)
+                out = handler(a, b, flags)
+                if type(out) is Pending:
+                    self._defer(out, msg, MessageType.COMPUTE_OK)
+                    return
+                result, extra = out
                 response = Message(
                     msg_type=MessageType.COMPUTE_OK,
                     msg_id=msg.msg_id,
@@ -327,6 +691,8 @@ class NodeKernel:
         self.status = NodeStatus.IDLE
         self.error_code = 0
         self.inbox.clear()
+        self._tx_streams.clear()
+        self._rx_streams.clear()
         # Don't clear outbox - may need to send response
         self._trace('RESET', msg)
     
@@ -354,26 +720,331 @@ class NodeKernel:
         self.status = NodeStatus.HALTED
         self._trace('HALT', msg)
     
+    def _handle_load(self, msg: Message):
+        """Handle LOAD - reassemble a block and write it to memory."""
+        if msg.flags & MessageFlags.STREAM_ACK:
+            self._stream_ack(msg)
+            return
+        if not msg.flags & MessageFlags.FRAGMENT:
+            self.errors += 1
+            self._trace('UNKNOWN', msg)
+            return
+        
+        data = self._recv_fragment(msg)
+        if data is None:
+            return
+        
+        # Stream: addr (16-bit LE) + block
+        addr = data[0] | (data[1] << 8)
+        block = data[2:]
+        self.write_block(addr, block)
+        
+        response = Message(
+            msg_type=MessageType.LOAD_OK,
+            msg_id=msg.msg_id,
+            src_node=self.node_id,
+            dst_node=msg.src_node,
+            payload=bytes([len(block) & 0xFF, len(block) >> 8]),
+        )
+        self.send_message(response)
+    
+    def _handle_dump(self, msg: Message):
+        """Handle DUMP - stream a memory block back as DUMP_DATA fragments."""
+        payload = msg.payload
+        addr = payload[0] | (payload[1] << 8)
+        length = payload[2] | (payload[3] << 8)
+        
+        self.send_stream(
+            MessageType.DUMP_DATA, msg.src_node, msg.msg_id,
+            self.read_block(addr, length),
+        )
+    
+    def _handle_dump_data(self, msg: Message):
+        """Handle DUMP_DATA - reassemble and complete pending request."""
+        if msg.flags & MessageFlags.STREAM_ACK:
+            self._stream_ack(msg)
+            return
+        
+        data = self._recv_fragment(msg)
+        if data is not None:
+            callback = self._pop_pending(msg.msg_id)
+            if callback:
+                callback(msg, data)
+    
+    # ========== Split-Phase Requests ==========
+    
+    def _defer(self, token: Pending, msg: Message, resp_type: MessageType):
+        """Hold a request open until its Pending token completes."""
+        token._msg_id = msg.msg_id
+        token._dst = msg.src_node
+        token._resp_type = resp_type
+        self._split_outstanding += 1
+        if token.ticks is not None:
+            self.schedule(token.ticks, self._fire_pending, token)
+        token._kernel = self
+        if token.done:
+            self._split_done.append(token)  # Completed before it was returned
+        self._trace('DEFER', msg)
+    
+    def _fire_pending(self, token: Pending):
+        """Timer callback: complete a Pending.after() token with fn()."""
+        try:
+            token.complete(*token.fn())
+        except Exception as e:
+            self._trace('ERROR', None, str(e))
+            token.fail()
+    
+    def _poll_split(self):
+        """Answer every completed token."""
+        done = self._split_done
+        while done:
+            token = done.popleft()
+            if token._answered:
+                continue
+            token._answered = True
+            self._split_outstanding -= 1
+            if token.error_code:
+                response = Message(
+                    msg_type=MessageType.EXEC_ERR,
+                    msg_id=token._msg_id,
+                    src_node=self.node_id,
+                    dst_node=token._dst,
+                    payload=bytes([token.error_code]),
+                )
+            else:
+                result, extra = token.value
+                response = Message(
+                    msg_type=token._resp_type,
+                    msg_id=token._msg_id,
+                    src_node=self.node_id,
+                    dst_node=token._dst,
+                    payload=bytes([result & 0xFF, extra & 0xFF]),
+                )
+            self.send_message(response)
+    
+    # ========== Batched Compute ==========
+    
+    def _poll_compute_batch(self):
+        """Flush the COMPUTE batch once its oldest request has waited long enough."""
+        if self.tick - self._compute_batch_tick >= self.compute_max_wait:
+            self._flush_compute_batch()
+    
+    def _flush_compute_batch(self):
+        """Evaluate queued COMPUTE requests in one call and answer each."""
+        batch = self._compute_batch
+        if not batch:
+            return
+        self._compute_batch = []
+        
+        _, _, ops, as_, bs, flags = zip(*batch)
+        try:
+            import numpy as np
+        except ImportError:
+            ops, as_, bs, flags = list(ops), list(as_), list(bs), list(flags)
+        else:
+            ops, as_, bs, flags = (np.array(v, dtype=np.uint8) for v in (ops, as_, bs, flags))
+        
+        self.compute_batches += 1
+        try:
+            results, out_flags = self.neural_processor.compute_batch(ops, as_, bs, flags)
+        except Exception as e:
+            self._trace('ERROR', None, str(e))
+            results = None
+        
+        for i, (msg_id, src, *_) in enumerate(batch):
+            if results is not None:
+                response = Message(
+                    msg_type=MessageType.COMPUTE_OK,
+                    msg_id=msg_id,
+                    src_node=self.node_id,
+                    dst_node=src,
+                    payload=bytes([int(results[i]) & 0xFF, int(out_flags[i]) & 0xFF]),
+                )
+            else:
+                response = Message(
+                    msg_type=MessageType.EXEC_ERR,
+                    msg_id=msg_id,
+                    src_node=self.node_id,
+                    dst_node=src,
+                    payload=bytes([0x02]),  # Error: compute failed
+                )
+            self.send_message(response)
+    
+    # ========== Fragmentation ==========
+    
+    def send_stream(self, msg_type: MessageType, dst: int, msg_id: int, data: bytes):
+        """
+        Send data of any length (up to 64 KB) as a train of fragments.
+        
+        At most frag_window frames are unacknowledged at a time; the
+        receiver acknowledges frames flagged ACK_REQ and each
+        acknowledgment releases more of the stream.
+        """
+        if len(data) > MAX_STREAM_BYTES:
+            raise ValueError(f"stream too long: {len(data)} bytes")
+        
+        stream = TxStream(
+            msg_type=msg_type,
+            dst=dst,
+            msg_id=msg_id,
+            data=bytes([len(data) & 0xFF, len(data) >> 8]) + bytes(data),
+        )
+        self._tx_streams[(dst, msg_id)] = stream
+        self._pump_stream(stream)
+    
+    def _pump_stream(self, stream: 'TxStream'):
+        """Send as many fragments as the window and outbox allow."""
+        window = self.frag_window
+        ack_every = max(1, window // 2)
+        outbox = self.outbox
+        total = stream.num_frames
+        
+        while (stream.sent < total and stream.sent - stream.acked < window
+               and len(outbox) < outbox.maxlen):
+            seq = stream.sent
+            flags = MessageFlags.FRAGMENT
+            if seq == total - 1:
+                flags |= MessageFlags.LAST_FRAG
+            elif (seq + 1) % ack_every == 0:
+                flags |= MessageFlags.ACK_REQ
+            
+            offset = seq * FRAG_DATA_SIZE
+            self.send_message(Message(
+                msg_type=stream.msg_type,
+                msg_id=stream.msg_id,
+                src_node=self.node_id,
+                dst_node=stream.dst,
+                payload=bytes([seq & 0xFF, seq >> 8])
+                        + stream.data[offset:offset + FRAG_DATA_SIZE],
+                flags=flags,
+            ))
+            stream.sent += 1
+        
+        if stream.sent == total:
+            self._tx_streams.pop((stream.dst, stream.msg_id), None)
+    
+    def _stream_ack(self, msg: Message):
+        """Handle a STREAM_ACK: slide the window of an outgoing stream."""
+        stream = self._tx_streams.get((msg.src_node, msg.msg_id))
+        if stream is None:
+            return
+        payload = msg.payload
+        stream.acked = max(stream.acked, payload[0] | (payload[1] << 8))
+        self._pump_stream(stream)
+    
+    def _recv_fragment(self, msg: Message) -> Optional[bytes]:
+        """
+        Add a fragment to its reassembly buffer.
+        
+        Returns the complete stream data on LAST_FRAG, else None.
+        A gap in the sequence abandons the stream.
+        """
+        key = (msg.src_node, msg.msg_id)
+        payload = msg.payload
+        seq = payload[0] | (payload[1] << 8)
+        
+        rx = self._rx_streams.get(key)
+        if rx is None:
+            rx = [0, bytearray()]
+            self._rx_streams[key] = rx
+        if seq != rx[0]:
+            del self._rx_streams[key]
+            self.errors += 1
+            self._trace('FRAG_LOST', msg)
+            return None
+        
+        rx[0] += 1
+        rx[1] += payload[2:]
+        
+        if msg.flags & MessageFlags.LAST_FRAG:
+            del self._rx_streams[key]
+            buf = rx[1]
+            length = buf[0] | (buf[1] << 8)
+            return bytes(buf[2:2 + length])
+        
+        if msg.flags & MessageFlags.ACK_REQ:
+            self.send_message(Message(
+                msg_type=msg.msg_type,
+                msg_id=msg.msg_id,
+                src_node=self.node_id,
+                dst_node=msg.src_node,
+                payload=bytes([rx[0] & 0xFF, rx[0] >> 8]),
+                flags=MessageFlags.STREAM_ACK,
+            ))
+        return None
+    
     # ========== Async Request/Response ==========
     
-    def send_request(self, msg: Message, callback: Optional[Callable] = None) -> int:
+    def send_request(self, msg: Message, callback: Optional[Callable] = None,
+                     timeout: Optional[int] = None,
+                     on_timeout: Optional[Callable] = None) -> int:
         """
         Send a request message and optionally register callback for response.
         
+        If no response arrives within `timeout` ticks (default:
+        request_timeout) the request expires: it is dropped from
+        pending, a late response is ignored, and on_timeout(msg_id)
+        is called.
+        
         Returns the msg_id for tracking.
         """
-        self.msg_seq = (self.msg_seq + 1) & 0xFF
-        msg.msg_id = self.msg_seq
+        msg.msg_id = self.alloc_msg_id()
         
-        if callback:
+        if timeout is None:
+            timeout = self.request_timeout
+        if callback or timeout is not None:
             self.pending[msg.msg_id] = callback
+        if timeout is not None:
+            timer = self.schedule(timeout, self._expire_request, msg.msg_id)
+            self._deadlines[msg.msg_id] = (timer, on_timeout)
         
         self.send_message(msg)
         return msg.msg_id
     
+    def cancel_request(self, msg_id: int) -> bool:
+        """
+        Abandon a pending request; a late response is ignored.
+        
+        Returns False if it was not pending.
+        """
+        if msg_id not in self.pending:
+            return False
+        self._pop_pending(msg_id)
+        self.requests_cancelled += 1
+        return True
+    
+    def _expire_request(self, msg_id: int):
+        """Deadline timer: drop an unanswered request and report it."""
+        _, on_timeout = self._deadlines.pop(msg_id)
+        self.pending.pop(msg_id, None)
+        self.requests_expired += 1
+        self._trace('TIMEOUT', None, f"request {msg_id}")
+        if on_timeout:
+            on_timeout(msg_id)
+    
+    def _pop_pending(self, msg_id: int) -> Optional[Callable]:
+        """Remove a pending request and its deadline; return its callback."""
+        deadline = self._deadlines.pop(msg_id, None)
+        if deadline:
+            self.timers.cancel(deadline[0])
+        return self.pending.pop(msg_id, None)
+    
+    def alloc_msg_id(self) -> int:
+        """
+        Advance msg_seq to the next request ID not in flight.
+        
+        IDs are 16-bit (1..MAX_MSG_ID) and wrap, skipping any ID still
+        in pending or reserved_ids, so concurrent requests never alias.
+        """
+        for _ in range(MAX_MSG_ID):
+            self.msg_seq = (self.msg_seq % MAX_MSG_ID) + 1
+            if self.msg_seq not in self.pending and self.msg_seq not in self.reserved_ids:
+                return self.msg_seq
+        raise RuntimeError(f"node {self.node_id}: all {MAX_MSG_ID} request IDs in flight")
+    
     def _complete_pending(self, msg: Message):
         """Complete a pending request with its response."""
-        callback = self.pending.pop(msg.msg_id, None)
+        callback = self._pop_pending(msg.msg_id)
         if callback:
             callback(msg)
     
@@ -398,10 +1069,49 @@ class NodeKernel:
         self.memory[addr & 0xFFFF] = value & 0xFF
         self.memory[(addr + 1) & 0xFFFF] = (value >> 8) & 0xFF
     
+    def read_block(self, addr: int, length: int) -> bytes:
+        """Read a block of memory (wraps at 64 KB)."""
+        addr &= 0xFFFF
+        end = addr + length
+        if end <= 0x10000:
+            return bytes(self.memory[addr:end])
+        return bytes(self.memory[addr:]) + bytes(self.memory[:end - 0x10000])
+    
+    def write_block(self, addr: int, data: bytes):
+        """Write a block of memory (wraps at 64 KB)."""
+        addr &= 0xFFFF
+        first = min(len(data), 0x10000 - addr)
+        self.memory[addr:addr + first] = data[:first]
+        if first < len(data):
+            self.memory[:len(data) - first] = data[first:]
+    
+    def memory_footprint(self) -> int:
+        """Bytes actually allocated for this node's memory."""
+        footprint = getattr(self.memory, 'footprint', None)
+        return footprint() if footprint else len(self.memory)
+    
     # ========== Tracing ==========
     
+    def set_trace(self, level: Union[str, int] = 'full',
+                  events: Optional[Iterable[str]] = None):
+        """
+        Set which events reach trace_callback.
+        
+        level is a trace level name or number (see trace.TRACE_LEVELS);
+        events, if given, further restricts tracing to those names.
+        """
+        self.trace_level, self.trace_only = trace_filter(level, events)
+        self._trace_send = traced('SEND', self.trace_level, self.trace_only)
+        self._trace_recv = traced('RECV', self.trace_level, self.trace_only)
+    
     def _trace(self, event: str, msg: Optional[Message] = None, extra: str = ''):
         """Record a trace event."""
+        if self.trace_buffer is None and not self.trace_callback:
+            return
+        if not traced(event, self.trace_level, self.trace_only):
+            return
+        if self.trace_buffer is not None:
+            self.trace_buffer.record(self.tick, self.node_id, event, msg, extra)
         if self.trace_callback:
             self.trace_callback(self.node_id, self.tick, event, msg, extra)
     
@@ -418,7 +1128,19 @@ class NodeKernel:
             'errors': self.errors,
             'inbox_depth': len(self.inbox),
             'outbox_depth': len(self.outbox),
+            'backlog_depth': len(self.backlog),
+            'send_blocked': self.send_blocked,
             'pending_requests': len(self.pending),
+            'requests_expired': self.requests_expired,
+            'requests_cancelled': self.requests_cancelled,
+            'tx_streams': len(self._tx_streams),
+            'rx_streams': len(self._rx_streams),
+            'quantum': self.quantum,
+            'memory_bytes': self.memory_footprint(),
+            'compute_batches': self.compute_batches,
+            'compute_queued': len(self._compute_batch),
+            'split_outstanding': self._split_outstanding,
+            'timers': self.timers.active,
         }
     
     def dump_state(self) -> Dict:
@@ -13,7 +13,7 @@ Commands:
     send <node> <a> <b> - Send ADD operation
     run <node|all> <op> <a> <b> - Execute operation
     route <op> <a> <b> - Route to best node
-    trace [on|off|show] - Tracing control
+    trace [on|off|show|<level>] - Tracing control
     stats           - System statistics
     topo            - Show topology
     inspect <node>  - Inspect node state
@@ -44,7 +44,6 @@ class SquaresShell:
     def __init__(self, os: Optional[HSquaresOS] = None):
         self.os = os or HSquaresOS()
         self.running = False
-        self.trace_enabled = False
         self.prompt = '> '
         self.variables: Dict[str, str] = {}
         
@@ -294,21 +293,53 @@ class SquaresShell:
             return "error: no nodes available"
     
     def cmd_trace(self, args: List[str]) -> str:
-        """Trace control: trace [on|off|show]"""
+        """Trace control: trace [on|off|show|errors|control|full]"""
         if not args:
-            return f"trace: {'on' if self.trace_enabled else 'off'}"
+            return f"trace: {self.os.trace_level}"
         
         subcmd = args[0].lower()
         if subcmd == 'on':
-            self.trace_enabled = True
+            self.os.set_trace('full')
             return "trace enabled"
         elif subcmd == 'off':
-            self.trace_enabled = False
+            self.os.set_trace('off')
             return "trace disabled"
+        elif subcmd in ('errors', 'control', 'full'):
+            self.os.set_trace(subcmd)
+            return f"trace: {subcmd}"
         elif subcmd == 'show':
             return self.os.fabric.dump_trace()
+        elif subcmd == 'find':
+            return self._trace_find(args[1:])
         else:
-            return "usage: trace [on|off|show]"
+            return "usage: trace [on|off|show|errors|control|full|find ...]"
+    
+    def _trace_find(self, args: List[str]) -> str:
+        """trace find [node=N[,N]] [event=E[,E]] [ticks=A:B] [id=N] [last=N]"""
+        query: Dict[str, Any] = {}
+        try:
+            for arg in args:
+                key, _, value = arg.partition('=')
+                if key == 'node':
+                    query['node'] = [int(n) for n in value.split(',')]
+                elif key == 'event':
+                    query['event'] = value.upper().split(',')
+                elif key == 'ticks':
+                    start, _, stop = value.partition(':')
+                    query['tick_range'] = (int(start or 0), int(stop) if stop else 1 << 62)
+                elif key == 'id':
+                    query['msg_id'] = int(value, 0)
+                elif key == 'last':
+                    query['limit'] = int(value)
+                else:
+                    raise ValueError(key)
+        except ValueError:
+            return "usage: trace find [node=N[,N]] [event=E[,E]] [ticks=A:B] [id=N] [last=N]"
+        
+        entries = self.os.fabric.query_trace(**query)
+        if not entries:
+            return "no matching trace entries"
+        return "\n".join(str(entry) for entry in entries)
     
     def cmd_stats(self, args: List[str]) -> str:
         """Show system statistics."""
@@ -452,11 +483,11 @@ class SquaresShell:
             log = self.os.stop_recording()
             return f"recording stopped ({len(log)} messages)"
         elif subcmd == 'show':
-            rec = self.os.get_recording()
+            rec = self.os.get_recording(20)  # Last 20
             if not rec:
                 return "(empty)"
             lines = []
-            for entry in rec[-20:]:  # Last 20
+            for entry in rec:
                 lines.append(
                     f"[{entry['tick']:3d}] {entry['type']:<12} "
                     f"{entry['src']}→{entry['dst']} {entry['payload']}"
@@ -471,8 +502,8 @@ class SquaresShell:
         if not log:
             return "no recording to replay"
         
-        self.os.replay(log)
-        return f"replayed {len(log)} messages"
+        matched = self.os.replay(log)
+        return f"replayed {len(log)} messages: {'match' if matched else 'MISMATCH'}"
     
     def cmd_snapshot(self, args: List[str]) -> str:
         """Take system snapshot."""
@@ -627,7 +658,8 @@ Commands:
   send <n> <a> <b>  Add a+b on node n
   run <n|all> <op> <a> <b>  Run operation
   route <op> <a> <b>  Route to best node
-  trace [on|off|show]  Trace control
+  trace [on|off|show]  Trace control (or errors|control|full)
+  trace find [node=N] [event=E] [ticks=A:B] [id=N]  Query trace
   stats           System statistics
   topo            Show topology
   inspect <n>     Inspect node state
@@ -11,13 +11,19 @@ Components:
 """
 
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Callable, Any, Tuple
+from typing import Dict, List, Optional, Callable, Any, Tuple, Iterable, Union
 from collections import deque
+import heapq
 import time
 
-from .message import Message, MessageType, MessageFlags, ping_msg, exec_msg, compute_msg
-from .node_kernel import NodeKernel, NodeStatus, OpCode
+from .message import (Message, MessageType, MessageFlags, MessageLog,
+                      ping_msg, exec_msg, compute_msg)
+from .node_kernel import NodeKernel, NodeStatus, OpCode, DispatchTable, MAX_STREAM_BYTES
 from .fabric_kernel import FabricKernel, NodeEntry, Capability
+from .memory import PagedMemory, MemoryArena
+from .timers import Timer, TimerWheel
+from .trace import TRACE_OFF, TRACE_LEVELS, parse_level
+from .trace_file import TraceSink
 
 
 class MessageBus:
@@ -25,57 +31,365 @@ class MessageBus:
     The message bus connecting all nodes.
     
     Star topology: all messages route through master.
+    
+    With flow_control (the default) a node's free inbox slots are its
+    credit: a message for a node with a full inbox is held on the bus,
+    in order, until the node makes room, instead of being dropped.
+    Ticks on which anything is held count as stalled.
+    
+    With a recorder (a MessageLog) every delivery is logged as
+    (tick, destination, frame), a broadcast once per recipient.
     """
     
-    def __init__(self):
+    def __init__(self, flow_control: bool = True):
         self.nodes: Dict[int, NodeKernel] = {}
         self.in_flight: deque = deque()
         self.delivered: int = 0
         self.dropped: int = 0
+        self.now = 0
+        
+        # Delivery log (None: not recording)
+        self.recorder: Optional[MessageLog] = None
+        
+        # Flow control: dst_id → messages held for that node
+        self.flow_control = flow_control
+        self.held: Dict[int, deque] = {}
+        self.held_count = 0
+        self.stalled_ticks = 0
+        self.node_stalls: Dict[int, int] = {}
     
     def register_node(self, node: NodeKernel):
         """Register a node on the bus."""
         self.nodes[node.node_id] = node
     
-    def tick(self) -> int:
+    def would_block(self, dst: int) -> bool:
+        """Would a message sent to dst now be held rather than delivered?"""
+        node = self.nodes.get(dst)
+        if node is None or not self.flow_control:
+            return False
+        return dst in self.held or len(node.inbox) >= node.inbox.maxlen
+    
+    def _deliver(self, node: NodeKernel, msg: Message, now: Optional[int]) -> int:
+        """Deliver msg to node, or hold it if node has no credit. Returns 1 if delivered."""
+        if self.flow_control:
+            nid = node.node_id
+            held = self.held.get(nid)
+            if held is not None or len(node.inbox) >= node.inbox.maxlen:
+                if held is None:
+                    held = self.held[nid] = deque()
+                held.append(msg)
+                self.held_count += 1
+                return 0
+        if now is not None:
+            node.tick = now
+        if self.recorder is not None:
+            self.recorder.append(self.now, node.node_id, msg)
+        node.recv_message(msg)
+        return 1
+    
+    def _release_held(self, now: Optional[int]) -> int:
+        """Deliver held messages to nodes that have made room. Returns number delivered."""
+        delivered = 0
+        for nid in list(self.held):
+            held = self.held[nid]
+            node = self.nodes[nid]
+            room = node.inbox.maxlen - len(node.inbox)
+            if room <= 0:
+                continue
+            if now is not None:
+                node.tick = now
+            while held and room:
+                msg = held.popleft()
+                if self.recorder is not None:
+                    self.recorder.append(self.now, nid, msg)
+                node.recv_message(msg)
+                room -= 1
+                delivered += 1
+            if not held:
+                del self.held[nid]
+        self.held_count -= delivered
+        return delivered
+    
+    def _note_stalls(self):
+        """Count a stalled tick for every node with held messages."""
+        self.stalled_ticks += 1
+        for nid in self.held:
+            self.node_stalls[nid] = self.node_stalls.get(nid, 0) + 1
+    
+    def tick(self, sources: Optional[List[int]] = None, now: Optional[int] = None) -> int:
         """
         Process one tick of bus activity.
         
-        Collects outgoing messages from all nodes and delivers them.
+        Collects outgoing messages from all nodes (or only the given
+        source node IDs, in order) and delivers them. If `now` is given,
+        each recipient's tick is brought up to it before delivery.
         Returns number of messages delivered.
         """
+        self.now = self.now + 1 if now is None else now
         delivered = 0
+        nodes = self.nodes
         
-        # Collect outgoing messages from all nodes
-        for node in self.nodes.values():
+        # Collect outgoing messages
+        senders = nodes.values() if sources is None else [nodes[nid] for nid in sources]
+        for node in senders:
             while True:
                 msg = node.get_outgoing()
                 if msg is None:
                     break
                 self.in_flight.append(msg)
         
+        # Held messages go first, keeping per-destination order
+        if self.held:
+            delivered += self._release_held(now)
+        
         # Deliver messages
         while self.in_flight:
             msg = self.in_flight.popleft()
             
             # Route message
             if msg.flags & MessageFlags.BROADCAST:
-                # Deliver to all nodes except sender
-                for nid, node in self.nodes.items():
+                # Deliver to all nodes except sender (one reference each)
+                first = True
+                for nid, node in nodes.items():
                     if nid != msg.src_node:
-                        node.recv_message(msg)
-                        delivered += 1
+                        if not first:
+                            msg.retain()
+                        first = False
+                        delivered += self._deliver(node, msg, now)
+                if first:
+                    msg.release()
             else:
                 # Deliver to destination
-                dst_node = self.nodes.get(msg.dst_node)
+                dst_node = nodes.get(msg.dst_node)
                 if dst_node:
-                    dst_node.recv_message(msg)
-                    delivered += 1
+                    delivered += self._deliver(dst_node, msg, now)
+                else:
+                    self.dropped += 1
+                    msg.release()
+        
+        if self.held:
+            self._note_stalls()
+        
+        self.delivered += delivered
+        return delivered
+    
+    def next_delivery(self) -> Optional[int]:
+        """Tick of the next scheduled delivery (None: nothing scheduled)."""
+        return None
+    
+
+class EventBus(MessageBus):
+    """
+    Discrete-event message bus with a per-link latency model.
+    
+    Collected messages are not delivered immediately: each one is put
+    on a calendar queue, timestamped with the tick it arrives at its
+    destination. A link (src, dst) has a latency in ticks and an
+    optional bandwidth in frames per tick; frames queue behind each
+    other on a saturated link. With latency 0 and unlimited bandwidth
+    the delivery order is identical to MessageBus.
+    
+    The scheduler can ask next_delivery() and jump the clock straight
+    to the next event.
+    """
+    
+    def __init__(self, latency: int = 0, bandwidth: Optional[float] = None,
+                 flow_control: bool = True):
+        super().__init__(flow_control)
+        self.default_latency = latency
+        self.default_bandwidth = bandwidth
+        self.links: Dict[Tuple[int, int], Tuple[int, Optional[float]]] = {}
+        
+        # Calendar: heap of (deliver_tick, seq, dst_id, sent_tick, msg)
+        self.calendar: List[Tuple[int, int, int, int, Message]] = []
+        self._seq = 0
+        self._link_free: Dict[Tuple[int, int], float] = {}
+        
+        # Latency statistics
+        self.total_latency = 0
+        self.max_latency = 0
+    
+    def set_link(self, src: int, dst: int, latency: int = 0,
+                 bandwidth: Optional[float] = None, symmetric: bool = True):
+        """Set latency (ticks) and bandwidth (frames/tick) for a link."""
+        self.links[(src, dst)] = (latency, bandwidth)
+        if symmetric:
+            self.links[(dst, src)] = (latency, bandwidth)
+    
+    def _schedule(self, msg: Message, dst: int):
+        """Put a message on the calendar for one destination."""
+        link = (msg.src_node, dst)
+        latency, bandwidth = self.links.get(
+            link, (self.default_latency, self.default_bandwidth)
+        )
+        
+        depart = float(self.now)
+        if bandwidth:
+            depart = max(depart, self._link_free.get(link, 0.0))
+            self._link_free[link] = depart + 1.0 / bandwidth
+        
+        deliver_at = int(depart) + latency
+        self._seq += 1
+        heapq.heappush(self.calendar, (deliver_at, self._seq, dst, self.now, msg))
+    
+    def tick(self, sources: Optional[List[int]] = None, now: Optional[int] = None) -> int:
+        """
+        Process one tick of bus activity.
+        
+        Collects outgoing messages, schedules them, and delivers every
+        message whose arrival tick has come. Returns number delivered.
+        """
+        self.now = self.now + 1 if now is None else now
+        nodes = self.nodes
+        
+        # Collect and schedule outgoing messages
+        senders = nodes.values() if sources is None else [nodes[nid] for nid in sources]
+        for node in senders:
+            while True:
+                msg = node.get_outgoing()
+                if msg is None:
+                    break
+                if msg.flags & MessageFlags.BROADCAST:
+                    first = True
+                    for nid in nodes:
+                        if nid != msg.src_node:
+                            if not first:
+                                msg.retain()
+                            first = False
+                            self._schedule(msg, nid)
+                    if first:
+                        msg.release()
+                elif msg.dst_node in nodes:
+                    self._schedule(msg, msg.dst_node)
                 else:
                     self.dropped += 1
+                    msg.release()
+        
+        # Deliver everything due (held messages first)
+        delivered = self._release_held(now) if self.held else 0
+        calendar = self.calendar
+        while calendar and calendar[0][0] <= self.now:
+            _, _, dst, sent_at, msg = heapq.heappop(calendar)
+            delivered += self._deliver(nodes[dst], msg, now)
+            
+            latency = self.now - sent_at
+            self.total_latency += latency
+            if latency > self.max_latency:
+                self.max_latency = latency
+        
+        if self.held:
+            self._note_stalls()
         
         self.delivered += delivered
         return delivered
+    
+    def next_delivery(self) -> Optional[int]:
+        """Tick of the next scheduled delivery (None: nothing scheduled)."""
+        return self.calendar[0][0] if self.calendar else None
+    
+
+class RequestHandle:
+    """
+    Handle for a request submitted to the fabric.
+    
+    Returned by HSquaresOS.submit(). Resolves when the master receives
+    the matching response, or with expired set when its deadline
+    passes first; use HSquaresOS.wait() / wait_all() / drain() to
+    advance ticks until it does.
+    """
+    
+    __slots__ = ('msg_id', 'node', 'request', 'response', 'done',
+                 'submitted_tick', 'completed_tick', 'sent',
+                 'stream', 'data', 'weight', 'expired',
+                 '_ok', '_result', '_callbacks', '_deadline', '_send_timeout')
+    
+    def __init__(self, msg_id: int, node: int, request: Message, tick: int):
+        self.msg_id = msg_id
+        self.node = node
+        self.request = request
+        request.retain()
+        self.response: Optional[Message] = None
+        self.done = False
+        self.submitted_tick = tick
+        self.completed_tick: Optional[int] = None
+        self.sent = False
+        self.stream: Optional[bytes] = None   # Outgoing fragmented payload
+        self.data: Optional[bytes] = None     # Reassembled response data
+        self.weight = 1                       # In-flight window slots used
+        self.expired = False
+        self._ok = False
+        self._result: Optional[Tuple[int, int]] = None
+        self._callbacks: Optional[List[Callable]] = None
+        self._deadline: Optional[Timer] = None
+        self._send_timeout: Optional[int] = None  # Deadline to arm when sent
+    
+    @property
+    def ok(self) -> bool:
+        """Did the node answer with the expected response type?"""
+        return self._ok
+    
+    def result(self) -> Optional[Tuple[int, int]]:
+        """Return (result, extra) from the response, or None if failed/pending."""
+        return self._result
+    
+    def add_done_callback(self, callback: Callable[['RequestHandle'], None]):
+        """Call callback(handle) when the response arrives (immediately if done)."""
+        if self.done:
+            callback(self)
+        elif self._callbacks is None:
+            self._callbacks = [callback]
+        else:
+            self._callbacks.append(callback)
+    
+    def release(self):
+        """Drop the request/response messages (returning pooled ones)."""
+        if self.request is not None:
+            self.request.release()
+            self.request = None
+        if self.response is not None:
+            self.response.release()
+            self.response = None
+    
+    def _resolve(self, msg: Message, tick: int, data: Optional[bytes] = None):
+        """Attach the response and fire completion callbacks."""
+        msg.retain()
+        self.response = msg
+        self.data = data
+        self.done = True
+        self.completed_tick = tick
+        self._ok = msg.msg_type == self.request.msg_type.response_type
+        if self._ok:
+            payload = msg.payload
+            self._result = (payload[0], payload[1])
+        self._run_callbacks()
+    
+    def _expire(self, tick: int):
+        """Resolve without a response (deadline passed)."""
+        self.done = True
+        self.expired = True
+        self.completed_tick = tick
+        self._run_callbacks()
+    
+    def _run_callbacks(self):
+        """Fire completion callbacks once."""
+        if self._callbacks:
+            callbacks, self._callbacks = self._callbacks, None
+            for callback in callbacks:
+                callback(self)
+    
+    @property
+    def latency(self) -> Optional[int]:
+        """Ticks from submission to completion."""
+        if self.completed_tick is None:
+            return None
+        return self.completed_tick - self.submitted_tick
+    
+    def __repr__(self) -> str:
+        if self.expired:
+            state = 'expired'
+        else:
+            state = 'done' if self.done else ('sent' if self.sent else 'queued')
+        return f"RequestHandle(id={self.msg_id}, node={self.node}, {state})"
 
 
 class HSquaresOS:
@@ -100,16 +414,97 @@ class HSquaresOS:
         
         # Run multiple ticks
         os.run(ticks=100)
+    
+    Schedulers:
+        'full'   Step every node and poll every outbox each tick
+        'ready'  Touch only nodes with queued messages; with
+                 fast_forward, idle stretches advance tick_count
+                 in one jump
+    
+    Engines:
+        'tick'   MessageBus: delivery in the tick a message is sent
+        'event'  EventBus: timestamped deliveries with per-link
+                 latency/bandwidth (os.bus.set_link); implies the
+                 ready scheduler with fast_forward, so the clock
+                 jumps straight to the next event
+    
+    quantum / master_quantum set each node's processing budget in
+    messages per tick (NodeKernel.quantum); master_quantum defaults
+    to quantum.
+    
+    flow_control (default on) makes the bus hold messages for a full
+    inbox instead of dropping them (see MessageBus).
+    
+    op_backend='lut' answers built-in ops from shared precomputed
+    tables (see lut.OpTables) instead of computing them.
+    
+    request_timeout gives every submitted request a deadline in
+    ticks, counted from when it goes on the wire (time queued behind
+    the in-flight window does not count): if no response arrives by
+    then the request is dropped and its handle resolves with expired
+    set (see set_deadline). By default submitted requests wait until
+    answered or cancelled.
+    
+    trace_level ('off', 'errors', 'control' or 'full', the default)
+    selects which events reach the fabric trace log; set_trace() also
+    masks by event name and node.
+    
+    record logs every bus delivery to a MessageLog from construction
+    on, for replay(). It is off by default: the log is unbounded and
+    costs time on every delivery. start_recording() turns it on later.
+    
+    Memory models:
+        'flat'   A 64 KB bytearray per node
+        'paged'  PagedMemory: 256-byte pages allocated on first
+                 write, so footprint follows the working set
+        'arena'  One MemoryArena shared by all nodes (os.arena);
+                 each node's memory is a memoryview row
+        'mmap'   As 'arena', backed by an anonymous mmap
     """
     
-    def __init__(self, num_workers: int = 8):
+    SCHEDULERS = ('full', 'ready')
+    ENGINES = ('tick', 'event')
+    MEMORY_MODELS = ('flat', 'paged', 'arena', 'mmap')
+    
+    def __init__(self, num_workers: int = 8, scheduler: str = 'full',
+                 fast_forward: bool = False, engine: str = 'tick',
+                 quantum: int = 1, master_quantum: Optional[int] = None,
+                 flow_control: bool = True, memory: str = 'flat',
+                 op_backend: str = 'python', request_timeout: Optional[int] = None,
+                 trace_level: str = 'full', record: bool = False):
+        if scheduler not in self.SCHEDULERS:
+            raise ValueError(f"unknown scheduler: {scheduler}")
+        if engine not in self.ENGINES:
+            raise ValueError(f"unknown engine: {engine}")
+        if memory not in self.MEMORY_MODELS:
+            raise ValueError(f"unknown memory model: {memory}")
+        if master_quantum is None:
+            master_quantum = quantum
+        if quantum < 1 or master_quantum < 1:
+            raise ValueError("quantum must be at least 1")
+        
+        if engine == 'event':
+            scheduler = 'ready'
+            fast_forward = True
+        
         self.num_workers = num_workers
+        self.scheduler = scheduler
+        self.fast_forward = fast_forward and scheduler == 'ready'
+        self.engine = engine
+        self.memory_model = memory
+        self.arena: Optional[MemoryArena] = None
+        if memory in ('arena', 'mmap'):
+            self.arena = MemoryArena(num_workers + 1, use_mmap=memory == 'mmap')
         
         # Create bus
-        self.bus = MessageBus()
+        if engine == 'event':
+            self.bus = EventBus(flow_control=flow_control)
+        else:
+            self.bus = MessageBus(flow_control=flow_control)
         
         # Create master node
-        self.master = NodeKernel(node_id=0, is_master=True)
+        self.master = NodeKernel(node_id=0, is_master=True, quantum=master_quantum,
+                                 memory=self._new_memory(0), op_backend=op_backend)
         self.bus.register_node(self.master)
         
         # Create fabric kernel on master
@@ -118,21 +513,40 @@ class HSquaresOS:
         # Create worker nodes
         self.workers: Dict[int, NodeKernel] = {}
         for i in range(1, num_workers + 1):
-            worker = NodeKernel(node_id=i)
+            worker = NodeKernel(node_id=i, quantum=quantum, memory=self._new_memory(i),
+                                op_backend=op_backend)
             self.workers[i] = worker
             self.bus.register_node(worker)
         
         # System state
         self.tick_count = 0
+        
+        # Fabric timer service (timeouts, retries, periodic tasks)
+        self.timers = TimerWheel()
         self.booted = False
         self.paused = False
         
-        # Response collection
-        self._pending_responses: Dict[int, Optional[Message]] = {}
+        # Response collection (msg_id → handle, queued or in flight)
+        self._pending_responses: Dict[int, RequestHandle] = {}
+        self.request_timeout = request_timeout
+        self.requests_expired = 0
+        self.requests_cancelled = 0
         
-        # Replay support
-        self._recording = True
-        self._message_log: List[Message] = []
+        # Pipelined submission: requests wait here until the in-flight
+        # window has room, so mailboxes never overflow
+        self._submit_queue: deque = deque()
+        self._in_flight = 0
+        self.max_in_flight = self.master.inbox.maxlen
+        
+        # Request IDs come from the master's sequence, which skips IDs
+        # still outstanding here
+        self.master.reserved_ids = self._pending_responses
+        
+        # Replay support: the bus logs deliveries while recording
+        self._recording = record
+        self._message_log = MessageLog()
+        if record:
+            self.bus.recorder = self._message_log
         
         # Setup master to handle responses
         self.master.handlers[MessageType.PONG] = self._master_handle_pong
@@ -140,24 +554,54 @@ class HSquaresOS:
         self.master.handlers[MessageType.EXEC_ERR] = self._master_handle_response
         self.master.handlers[MessageType.COMPUTE_OK] = self._master_handle_response
         self.master.handlers[MessageType.STATUS_RPL] = self._master_handle_response
+        self.master.handlers[MessageType.LOAD_OK] = self._master_handle_response
+        self.master.handlers[MessageType.DUMP_DATA] = self._master_handle_dump_data
         
-        # Setup trace callback
+        # Each node traces into its own buffer; the fabric merges them
         for node in [self.master] + list(self.workers.values()):
-            node.trace_callback = self._trace_callback
+            self.fabric.attach_trace(node)
+        self.set_trace(trace_level)
+        
+        # Ready set: IDs of nodes with a non-empty inbox or outbox
+        self._ready: set = set()
+        if scheduler == 'ready':
+            for node in [self.master] + list(self.workers.values()):
+                node.ready_set = self._ready
+                node.clock = self._clock
+    
+    def _new_memory(self, node_id: int):
+        """Allocate one node's memory for the configured model."""
+        if self.arena is not None:
+            return self.arena.view(node_id)
+        if self.memory_model == 'paged':
+            return PagedMemory()
+        return bytearray(65536)
     
-    def _trace_callback(self, node_id: int, tick: int, event: str, 
-                        msg: Optional[Message], extra: str):
-        """Unified trace callback."""
-        self.fabric.trace(tick, node_id, event, msg, extra)
+    def _clock(self) -> int:
+        """System tick (NodeKernel.clock)."""
+        return self.tick_count
     
     def _master_handle_pong(self, msg: Message):
         """Master handles PONG (heartbeat response)."""
         self.fabric.handle_heartbeat_response(msg, self.tick_count)
-        self._pending_responses[msg.msg_id] = msg
+        self._master_handle_response(msg)
     
-    def _master_handle_response(self, msg: Message):
+    def _master_handle_response(self, msg: Message, data: Optional[bytes] = None):
         """Master handles response messages."""
-        self._pending_responses[msg.msg_id] = msg
+        handle = self._pending_responses.get(msg.msg_id)
+        if handle is None or handle.node != msg.src_node:
+            return  # Late or unsolicited response
+        self._forget(handle)
+        handle._resolve(msg, self.tick_count, data)
+    
+    def _master_handle_dump_data(self, msg: Message):
+        """Master reassembles DUMP_DATA fragments, then resolves the request."""
+        if msg.flags & MessageFlags.STREAM_ACK:
+            self.master._stream_ack(msg)
+            return
+        data = self.master._recv_fragment(msg)
+        if data is not None:
+            self._master_handle_response(msg, data)
     
     # ========== Boot Sequence ==========
     
@@ -178,34 +622,25 @@ class HSquaresOS:
             self.fabric.set_node_status(i, NodeStatus.OFFLINE)
         
         # Ping each worker
-        for i in range(1, self.num_workers + 1):
-            msg = ping_msg(src=0, dst=i, msg_id=i)
-            self._pending_responses[i] = None
-            self.master.send_message(msg)
+        handles = {
+            i: self.submit_ping(i)
+            for i in range(1, self.num_workers + 1)
+        }
         
         # Run until responses or timeout
-        for _ in range(100):  # Max 100 ticks for boot
-            self._tick()
-            
-            # Check if all responded
-            all_done = all(
-                self._pending_responses.get(i) is not None
-                for i in range(1, self.num_workers + 1)
-            )
-            if all_done:
-                break
+        self.wait_all(handles.values(), timeout=100)  # Max 100 ticks for boot
         
         # Record results
-        for i in range(1, self.num_workers + 1):
-            response = self._pending_responses.get(i)
-            if response and response.msg_type == MessageType.PONG:
+        for i, handle in handles.items():
+            if handle.ok:
                 self.fabric.set_node_status(i, NodeStatus.IDLE)
                 self.fabric.update_heartbeat(i, self.tick_count, NodeStatus.IDLE, 0)
                 results[i] = True
             else:
                 results[i] = False
+            handle.release()
         
-        self._pending_responses.clear()
+        self._cancel_all()
         self.booted = True
         
         return results
@@ -216,13 +651,85 @@ class HSquaresOS:
         """Execute one system tick."""
         self.tick_count += 1
         
-        # Run all node kernels
+        # Release queued requests into the window
+        if self._submit_queue:
+            self._pump_submissions()
+        
+        if self.scheduler == 'ready':
+            self._tick_ready()
+        else:
+            # Run all node kernels
+            self.master.step()
+            for worker in self.workers.values():
+                worker.step()
+            
+            # Process bus
+            self.bus.tick()
+        
+        if self.timers.active:
+            self.timers.advance(self.tick_count)
+    
+    def _tick_ready(self):
+        """
+        Execute one tick touching only ready nodes.
+        
+        Nodes are stepped and polled in ID order, so delivery order
+        matches the full scheduler exactly. An idle node's `tick` is
+        brought up to date when it is next stepped or delivered to; the
+        master always steps to keep its clock current for requests sent
+        from outside a tick.
+        """
+        now = self.tick_count
+        ready = self._ready
+        nodes = self.bus.nodes
+        
         self.master.step()
-        for worker in self.workers.values():
-            worker.step()
+        for nid in sorted(ready):
+            if nid != 0:
+                node = nodes[nid]
+                node.tick = now - 1
+                node.step()
+        
+        self.bus.tick(sorted(ready), now)
+        
+        for nid in list(ready):
+            if nodes[nid].is_idle():
+                ready.discard(nid)
+    
+    def _idle(self) -> bool:
+        """Can ticks be skipped? (fast_forward on, no message queued at a node)"""
+        return (
+            self.fast_forward
+            and not self._ready
+            and not self._submit_queue
+            and not self.bus.in_flight
+            and not self.bus.held_count
+        )
+    
+    def _advance(self, limit: Optional[int] = None) -> int:
+        """
+        Advance the clock by one tick, or fast-forward over idle ticks.
+        
+        When idle, jumps to just before the bus's next scheduled
+        delivery or fabric timer (at most `limit` ticks). Returns ticks
+        advanced; 0 means idle with nothing scheduled and no limit: the
+        system can never make progress on its own.
+        """
+        if self._idle():
+            skip = limit
+            for event in (self.bus.next_delivery(), self.timers.next_expiry()):
+                if event is not None:
+                    gap = event - self.tick_count - 1
+                    skip = gap if skip is None else min(skip, gap)
+            if skip is None:
+                return 0
+            if skip > 0:
+                self.tick_count += skip
+                self.master.tick = self.tick_count
+                return skip
         
-        # Process bus
-        self.bus.tick()
+        self._tick()
+        return 1
     
     def run(self, ticks: int = 1) -> int:
         """
@@ -231,11 +738,278 @@ class HSquaresOS:
         Returns number of messages processed.
         """
         total = 0
-        for _ in range(ticks):
-            self._tick()
-            total += 1
+        while total < ticks:
+            total += self._advance(ticks - total)
         return total
     
+    # ========== Timers ==========
+    
+    def schedule(self, after_ticks: int, callback: Callable, *args) -> Timer:
+        """Call callback(*args) after_ticks system ticks from now."""
+        self.timers.advance(self.tick_count)
+        return self.timers.schedule(after_ticks, callback, *args)
+    
+    def schedule_every(self, period: int, callback: Callable, *args) -> Timer:
+        """Call callback(*args) every `period` system ticks until cancelled."""
+        self.timers.advance(self.tick_count)
+        return self.timers.schedule_every(period, callback, *args)
+    
+    def cancel_timer(self, timer: Timer) -> bool:
+        """Cancel a fabric timer. Returns False if it already fired."""
+        return self.timers.cancel(timer)
+    
+    def start_supervisor(self, interval: Optional[int] = None) -> Timer:
+        """
+        Run the fabric supervisor periodically.
+        
+        Every `interval` ticks (default: fabric.heartbeat_interval) the
+        supervisor pings online workers and marks silent ones OFFLINE.
+        Cancel the returned timer to stop it.
+        """
+        # Heartbeat ages count from now, not from boot
+        for nid in self.fabric.get_online_nodes():
+            self.fabric.get_node(nid).last_heartbeat = self.tick_count
+        self.fabric.last_heartbeat_tick = self.tick_count
+        return self.schedule_every(interval or self.fabric.heartbeat_interval,
+                                   self._supervise)
+    
+    def _supervise(self):
+        """Periodic supervisor task."""
+        self.fabric.supervisor_tick(self.tick_count, self._send_heartbeat)
+    
+    def _send_heartbeat(self, msg: Message) -> int:
+        """Send a supervisor PING as a request, abandoned after one interval."""
+        msg.msg_id = self._next_request_id()
+        handle = self._submit(msg.dst_node, msg)
+        handle.add_done_callback(RequestHandle.release)
+        self.set_deadline(handle, self.fabric.heartbeat_interval)
+        return msg.msg_id
+    
+    # ========== Pipelined Requests ==========
+    
+    def _next_request_id(self) -> int:
+        """Allocate a msg_id not used by any outstanding request."""
+        return self.master.alloc_msg_id()
+    
+    def _submit(self, node: int, msg: Message) -> RequestHandle:
+        """Register a request message and queue it for sending."""
+        handle = RequestHandle(msg.msg_id, node, msg, self.tick_count)
+        self._register(handle)
+        return handle
+    
+    def _register(self, handle: RequestHandle):
+        """Track a new handle, set its default deadline and queue it."""
+        self._pending_responses[handle.msg_id] = handle
+        if self.request_timeout is not None:
+            self.set_deadline(handle, self.request_timeout, on_send=True)
+        self._submit_queue.append(handle)
+        self._pump_submissions()
+    
+    def _pump_submissions(self):
+        """Move queued requests to the master outbox while the window has room."""
+        queue = self._submit_queue
+        outbox = self.master.outbox
+        while queue and self._in_flight < self.max_in_flight and len(outbox) < outbox.maxlen:
+            handle = queue.popleft()
+            if handle.done or handle.msg_id not in self._pending_responses:
+                continue  # Cancelled while queued
+            handle.sent = True
+            self._in_flight += handle.weight
+            if handle._send_timeout is not None:
+                self.set_deadline(handle, handle._send_timeout)
+            if handle.stream is None:
+                self.master.send_message(handle.request)
+            else:
+                request = handle.request
+                try:
+                    self.master.send_stream(request.msg_type, request.dst_node,
+                                            request.msg_id, handle.stream)
+                except Exception:
+                    # Never on the wire: free its window slots and forget it
+                    self._forget(handle)
+                    handle.sent = False
+                    raise
+    
+    def _forget(self, handle: RequestHandle) -> bool:
+        """Drop an outstanding request from the tables; a late response is ignored."""
+        if self._pending_responses.get(handle.msg_id) is not handle:
+            return False
+        del self._pending_responses[handle.msg_id]
+        if handle.sent:
+            self._in_flight -= handle.weight
+        if handle._deadline is not None:
+            self.timers.cancel(handle._deadline)
+            handle._deadline = None
+        return True
+    
+    def set_deadline(self, handle: RequestHandle, ticks: int, on_send: bool = False):
+        """
+        Expire an outstanding request if unanswered `ticks` from now.
+        
+        With on_send, the ticks count from when the request goes on
+        the wire instead (from now if it already has); the default
+        request_timeout works this way. Replaces any earlier deadline.
+        On expiry the request is dropped, a late response is ignored,
+        and the handle resolves with expired set (done callbacks run,
+        result() is None).
+        """
+        if handle._deadline is not None:
+            self.timers.cancel(handle._deadline)
+            handle._deadline = None
+        handle._send_timeout = None
+        if on_send and not handle.sent:
+            handle._send_timeout = ticks
+            return
+        handle._deadline = self.schedule(ticks, self._expire, handle)
+    
+    def _expire(self, handle: RequestHandle):
+        """Deadline passed: drop the request and resolve its handle."""
+        handle._deadline = None
+        if self._forget(handle):
+            self.requests_expired += 1
+            handle._expire(self.tick_count)
+    
+    def cancel(self, handle: RequestHandle) -> bool:
+        """
+        Abandon an outstanding request; a late response is ignored.
+        
+        The handle stays unresolved. Returns False if it already
+        completed, expired or was cancelled.
+        """
+        if not self._forget(handle):
+            return False
+        self.requests_cancelled += 1
+        return True
+    
+    def _cancel_all(self):
+        """Expire every outstanding request."""
+        for handle in list(self._pending_responses.values()):
+            self._expire(handle)
+        self._submit_queue.clear()
+    
+    def submit(self, node: int, op: int, a: int = 0, b: int = 0,
+               flags: int = 0) -> RequestHandle:
+        """
+        Submit an EXEC without waiting for it.
+        
+        Any number of requests may be outstanding; at most max_in_flight
+        are on the wire at once, the rest are released as responses land.
+        """
+        msg = exec_msg(0, node, self._next_request_id(), op, a, b, flags)
+        return self._submit(node, msg)
+    
+    def submit_compute(self, node: int, op: int, a: int, b: int,
+                       flags: int = 0) -> RequestHandle:
+        """Submit a neural COMPUTE without waiting for it."""
+        msg = compute_msg(src=0, dst=node, msg_id=self._next_request_id(),
+                          op=op, a=a, b=b, flags=flags)
+        return self._submit(node, msg)
+    
+    def submit_dump(self, node: int, addr: int, length: int) -> RequestHandle:
+        """
+        Submit a DUMP of `length` bytes at `addr` without waiting for it.
+        
+        The node streams the block back as DUMP_DATA fragments; the
+        reassembled bytes land in handle.data. length is at most 0xFFFF.
+        """
+        if not 0 <= length <= 0xFFFF:
+            raise ValueError(f"dump length out of range: {length}")
+        msg = Message(
+            msg_type=MessageType.DUMP,
+            msg_id=self._next_request_id(),
+            src_node=0,
+            dst_node=node,
+            payload=bytes([addr & 0xFF, (addr >> 8) & 0xFF,
+                           length & 0xFF, (length >> 8) & 0xFF]),
+            flags=MessageFlags.ACK_REQ,
+        )
+        return self._submit_stream(node, msg, None)
+    
+    def submit_load_block(self, node: int, addr: int, data: bytes) -> RequestHandle:
+        """
+        Submit a block write without waiting for it.
+        
+        The block is streamed to the node as LOAD fragments; the node
+        answers LOAD_OK with the number of bytes written. The stream
+        starts with the 2-byte address, so data is at most
+        MAX_STREAM_BYTES - 2 bytes.
+        """
+        if len(data) > MAX_STREAM_BYTES - 2:
+            raise ValueError(f"block too long: {len(data)} bytes")
+        msg = Message(
+            msg_type=MessageType.LOAD,
+            msg_id=self._next_request_id(),
+            src_node=0,
+            dst_node=node,
+        )
+        header = bytes([addr & 0xFF, (addr >> 8) & 0xFF])
+        return self._submit_stream(node, msg, header + bytes(data))
+    
+    def _submit_stream(self, node: int, msg: Message,
+                       stream: Optional[bytes]) -> RequestHandle:
+        """Submit a request whose payload or response is fragmented."""
+        handle = RequestHandle(msg.msg_id, node, msg, self.tick_count)
+        handle.stream = stream
+        # A stream keeps up to frag_window frames in flight
+        handle.weight = min(self.master.frag_window, self.max_in_flight)
+        self._register(handle)
+        return handle
+    
+    def submit_ping(self, node: int) -> RequestHandle:
+        """Submit a PING without waiting for it."""
+        msg = ping_msg(src=0, dst=node, msg_id=self._next_request_id())
+        return self._submit(node, msg)
+    
+    def wait(self, handle: RequestHandle, timeout: int = 100) -> bool:
+        """
+        Run ticks until handle resolves.
+        
+        Returns True if it resolved within timeout ticks.
+        """
+        ticks = 0
+        while not handle.done and ticks < timeout:
+            ticks += self._advance(timeout - ticks)
+        return handle.done
+    
+    def wait_all(self, handles, timeout: Optional[int] = None) -> int:
+        """
+        Run ticks until every handle resolves (or timeout ticks pass).
+        
+        Returns number of ticks run.
+        """
+        waiting = [h for h in handles if not h.done]
+        ticks = 0
+        while waiting and (timeout is None or ticks < timeout):
+            advanced = self._advance(None if timeout is None else timeout - ticks)
+            if not advanced:
+                break  # Nothing in flight: no handle can resolve
+            ticks += advanced
+            waiting = [h for h in waiting if not h.done]
+        return ticks
+    
+    def drain(self, timeout: Optional[int] = None) -> int:
+        """
+        Run ticks until all outstanding requests resolve.
+        
+        Returns number of ticks run.
+        """
+        ticks = 0
+        while self._pending_responses and (timeout is None or ticks < timeout):
+            advanced = self._advance(None if timeout is None else timeout - ticks)
+            if not advanced:
+                break
+            ticks += advanced
+        return ticks
+    
+    def _finish(self, handle: RequestHandle, timeout: int) -> Optional[Tuple[int, int]]:
+        """Wait for a single request and decode its result."""
+        if not self.wait(handle, timeout):
+            self._expire(handle)
+        handle.release()
+        return handle.result()
+    
+    # ========== Blocking Operations ==========
+    
     def exec(self, node: int, op: int, a: int = 0, b: int = 0, 
              flags: int = 0, timeout: int = 100) -> Optional[Tuple[int, int]]:
         """
@@ -243,24 +1017,7 @@ class HSquaresOS:
         
         Returns (result, extra) or None on timeout.
         """
-        msg_id = self.master.msg_seq + 1
-        msg = exec_msg(0, node, msg_id, op, a, b, flags)
-        
-        self._pending_responses[msg_id] = None
-        self.master.send_message(msg)
-        
-        # Run until response or timeout
-        for _ in range(timeout):
-            self._tick()
-            response = self._pending_responses.get(msg_id)
-            if response:
-                del self._pending_responses[msg_id]
-                if response.msg_type == MessageType.EXEC_OK:
-                    return (response.payload[0], response.payload[1])
-                else:
-                    return None
-        
-        return None
+        return self._finish(self.submit(node, op, a, b, flags), timeout)
     
     def compute(self, node: int, op: int, a: int, b: int,
                 flags: int = 0, timeout: int = 100) -> Optional[Tuple[int, int]]:
@@ -269,24 +1026,7 @@ class HSquaresOS:
         
         Returns (result, flags) or None on timeout.
         """
-        msg_id = self.master.msg_seq + 1
-        msg = compute_msg(src=0, dst=node, msg_id=msg_id, op=op, a=a, b=b, flags=flags)
-        
-        self._pending_responses[msg_id] = None
-        self.master.send_message(msg)
-        
-        # Run until response or timeout
-        for _ in range(timeout):
-            self._tick()
-            response = self._pending_responses.get(msg_id)
-            if response:
-                del self._pending_responses[msg_id]
-                if response.msg_type == MessageType.COMPUTE_OK:
-                    return (response.payload[0], response.payload[1])
-                else:
-                    return None
-        
-        return None
+        return self._finish(self.submit_compute(node, op, a, b, flags), timeout)
     
     def route(self, op: int, a: int = 0, b: int = 0, 
               flags: int = 0, timeout: int = 100) -> Optional[Tuple[int, int, int]]:
@@ -311,46 +1051,53 @@ class HSquaresOS:
         
         Returns dict of node_id → (result, extra) or None.
         """
-        results = {}
-        online = self.fabric.get_online_nodes()
-        
-        # Send to all
-        msg_ids = {}
-        for node in online:
-            msg_id = self.master.msg_seq + 1
-            msg = exec_msg(0, node, msg_id, op, a, b, flags)
-            self._pending_responses[msg_id] = None
-            self.master.send_message(msg)
-            msg_ids[node] = msg_id
-        
-        # Collect responses
-        for _ in range(timeout):
-            self._tick()
-            
-            # Check all responses
-            all_done = True
-            for node, msg_id in msg_ids.items():
-                if node not in results:
-                    response = self._pending_responses.get(msg_id)
-                    if response:
-                        if response.msg_type == MessageType.EXEC_OK:
-                            results[node] = (response.payload[0], response.payload[1])
-                        else:
-                            results[node] = None
-                        del self._pending_responses[msg_id]
-                    else:
-                        all_done = False
-            
-            if all_done:
-                break
+        handles = {
+            node: self.submit(node, op, a, b, flags)
+            for node in self.fabric.get_online_nodes()
+        }
+        
+        self.wait_all(handles.values(), timeout)
         
-        # Mark timeouts
-        for node in online:
-            if node not in results:
-                results[node] = None
+        results = {}
+        for node, handle in handles.items():
+            if not handle.done:
+                self._expire(handle)
+            handle.release()
+            results[node] = handle.result()
         
         return results
     
+    def _stream_timeout(self, length: int) -> int:
+        """Default timeout for a block transfer of `length` bytes."""
+        return 100 + 4 * (length // 8 + 1)
+    
+    def dump(self, node: int, addr: int, length: int,
+             timeout: Optional[int] = None) -> Optional[bytes]:
+        """
+        Read `length` bytes of node memory at `addr` in one streamed transfer.
+        
+        Returns the bytes, or None on timeout.
+        """
+        handle = self.submit_dump(node, addr, length)
+        if not self.wait(handle, timeout or self._stream_timeout(length)):
+            self._expire(handle)
+        handle.release()
+        return handle.data if handle.ok else None
+    
+    def load_block(self, node: int, addr: int, data: bytes,
+                   timeout: Optional[int] = None) -> bool:
+        """
+        Write a block into node memory at `addr` in one streamed transfer.
+        
+        Returns True if the node confirmed the whole block.
+        """
+        handle = self.submit_load_block(node, addr, data)
+        if not self.wait(handle, timeout or self._stream_timeout(len(data))):
+            self._expire(handle)
+        handle.release()
+        result = handle.result()
+        return result is not None and (result[0] | (result[1] << 8)) == len(data)
+    
     # ========== Status and Introspection ==========
     
     def ping(self, node: int, timeout: int = 50) -> Optional[Tuple[int, int]]:
@@ -359,20 +1106,7 @@ class HSquaresOS:
         
         Returns (status, load) or None on timeout.
         """
-        msg_id = self.master.msg_seq + 1
-        msg = ping_msg(src=0, dst=node, msg_id=msg_id)
-        
-        self._pending_responses[msg_id] = None
-        self.master.send_message(msg)
-        
-        for _ in range(timeout):
-            self._tick()
-            response = self._pending_responses.get(msg_id)
-            if response and response.msg_type == MessageType.PONG:
-                del self._pending_responses[msg_id]
-                return (response.payload[0], response.payload[1])
-        
-        return None
+        return self._finish(self.submit_ping(node), timeout)
     
     def ping_all(self, timeout: int = 100) -> Dict[int, bool]:
         """Ping all workers, return online status."""
@@ -415,12 +1149,108 @@ class HSquaresOS:
             'booted': self.booted,
             'bus_delivered': self.bus.delivered,
             'bus_dropped': self.bus.dropped,
+            'bus_held': self.bus.held_count,
+            'bus_stalled_ticks': self.bus.stalled_ticks,
+            'requests_outstanding': len(self._pending_responses),
+            'requests_expired': self.requests_expired,
+            'requests_cancelled': self.requests_cancelled,
+            **({'bus_avg_latency': self.bus.total_latency / max(1, self.bus.delivered),
+                'bus_max_latency': self.bus.max_latency}
+               if self.engine == 'event' else {}),
             **self.fabric.get_fabric_stats(),
         }
     
+    def memory_footprint(self) -> Dict:
+        """Report node memory actually allocated across the fabric."""
+        nodes = [self.master] + list(self.workers.values())
+        if self.arena is not None:
+            allocated = self.arena.footprint()
+        else:
+            allocated = sum(node.memory_footprint() for node in nodes)
+        return {
+            'model': self.memory_model,
+            'nodes': len(nodes),
+            'bytes': allocated,
+            'bytes_per_node': allocated / len(nodes),
+            'flat_bytes': 65536 * len(nodes),
+        }
+    
+    def snapshot_memory(self) -> bytes:
+        """
+        Copy every node's memory (master first, then workers by ID).
+        
+        With an arena this is a single buffer copy.
+        """
+        if self.arena is not None:
+            return self.arena.snapshot()
+        nodes = [self.master] + list(self.workers.values())
+        return b''.join(bytes(node.memory[:]) for node in nodes)
+    
+    def restore_memory(self, snapshot: bytes):
+        """Restore every node's memory from snapshot_memory()."""
+        if self.arena is not None:
+            self.arena.restore(snapshot)
+            return
+        nodes = [self.master] + list(self.workers.values())
+        if len(snapshot) != 65536 * len(nodes):
+            raise ValueError(f"snapshot is {len(snapshot)} bytes, fabric has {len(nodes)} nodes")
+        view = memoryview(snapshot)
+        for i, node in enumerate(nodes):
+            node.write_block(0, view[i * 65536:(i + 1) * 65536])
+    
+    def set_trace(self, level: Union[str, int] = 'full',
+                  events: Optional[Iterable[str]] = None,
+                  nodes: Optional[Iterable[int]] = None):
+        """
+        Choose what is traced.
+        
+        level: 'off', 'errors', 'control' or 'full' (see trace.py)
+        events: only these event names (default: all at that level)
+        nodes: only events on these node IDs (default: all)
+        
+        Filtered events are dropped at the node before any trace
+        entry is built; with level 'off' a send or receive costs one
+        attribute check.
+        """
+        level = parse_level(level)
+        nodes = None if nodes is None else frozenset(nodes)
+        for node in [self.master] + list(self.workers.values()):
+            if nodes is None or node.node_id in nodes:
+                node.set_trace(level, events)
+            else:
+                node.set_trace(TRACE_OFF)
+        self.fabric.set_trace(level, events, nodes)
+        self.trace_level = TRACE_LEVELS[level]
+    
+    def export_trace(self, path: str, max_bytes: int = 64 << 20,
+                     buffer_records: int = 4096) -> TraceSink:
+        """
+        Stream every traced event to rotating binary files at `path`.
+        
+        The in-memory buffers keep working as before; the files keep
+        the complete run. Read them back with trace_file.TraceReader.
+        """
+        self.stop_trace_export()
+        sink = TraceSink(path, max_bytes, buffer_records)
+        for node in [self.master] + list(self.workers.values()):
+            node.trace_callback = sink
+        self.fabric.trace_sink = sink
+        return sink
+    
+    def stop_trace_export(self):
+        """Stop streaming the trace and close its files."""
+        sink = self.fabric.trace_sink
+        if sink is None:
+            return
+        for node in [self.master] + list(self.workers.values()):
+            if node.trace_callback is sink:
+                node.trace_callback = None
+        self.fabric.trace_sink = None
+        sink.close()
+    
     def trace(self, last_n: int = 20) -> str:
-        """Get recent trace log."""
-        return self.fabric.dump_trace()[-last_n*80:]  # Approximate
+        """Get the last_n trace entries as text."""
+        return self.fabric.dump_trace(last_n)
     
     # ========== Node Management ==========
     
@@ -444,10 +1274,15 @@ class HSquaresOS:
         self.master.send_message(msg)
         self.run(10)
     
-    def set_neural_processor(self, node: int, processor):
-        """Set the neural processor for a worker node."""
+    def set_neural_processor(self, node: int, processor, max_batch: int = 1, max_wait: int = 0):
+        """
+        Set the neural processor for a worker node.
+        
+        max_batch / max_wait enable batched COMPUTE for processors with
+        compute_batch() (see NodeKernel.set_neural_processor).
+        """
         if node in self.workers:
-            self.workers[node].set_neural_processor(processor)
+            self.workers[node].set_neural_processor(processor, max_batch, max_wait)
     
     # ========== Single-Step Execution ==========
     
@@ -513,62 +1348,153 @@ class HSquaresOS:
     # ========== Deterministic Replay ==========
     
     def start_recording(self):
-        """Start recording messages for replay."""
+        """Start a new recording of bus deliveries."""
         self._recording = True
-        self._message_log.clear()
+        self._message_log = MessageLog()
+        self.bus.recorder = self._message_log
     
-    def stop_recording(self) -> List[Message]:
-        """Stop recording and return message log."""
+    def stop_recording(self) -> MessageLog:
+        """Stop recording and return the message log."""
         self._recording = False
-        return list(self._message_log)
+        self.bus.recorder = None
+        return self._message_log
     
-    def get_recording(self) -> List[Dict]:
-        """Get current recording as list of dicts."""
-        return [
-            {
-                'tick': i,
+    def get_recording(self, last_n: Optional[int] = None) -> List[Dict]:
+        """Get current recording (or its last_n deliveries) as list of dicts."""
+        log = self._message_log
+        start = 0 if last_n is None else max(0, len(log) - last_n)
+        recording = []
+        for i in range(start, len(log)):
+            tick, dst, msg = log[i]
+            recording.append({
+                'tick': tick,
                 'type': msg.msg_type.name,
                 'id': msg.msg_id,
                 'src': msg.src_node,
-                'dst': msg.dst_node,
+                'dst': dst,
                 'payload': msg.payload[:msg.payload_len].hex(),
-            }
-            for i, msg in enumerate(self._message_log)
-        ]
+            })
+        return recording
     
-    def replay(self, log: List[Message]) -> bool:
+    def replay(self, log: Union[MessageLog, List[Message], None] = None) -> bool:
         """
-        Replay a message log from reset state.
+        Replay a message log against a fresh copy of the workers.
         
-        Returns True if replay matched exactly.
+        The log is replayed into a new, unbooted system configured
+        like this one (see _replica); this system is not touched.
+        Every logged delivery to a worker is injected at its recorded
+        tick, and the workers are stepped as the fabric would step
+        them; the master does not run. Workers start from power-on
+        state, so a recording should start at construction or with
+        the workers idle and their memory as it was at power-on.
+        
+        The replies the workers send are checked against the log, per
+        (source, destination) link and in order. Requests a worker
+        starts on its own (from a timer, say) are inputs like any
+        other delivery: they are injected from the log, not compared.
+        Frames still on their way when the log ends are not compared.
+        
+        log defaults to the current recording; a list of messages is
+        delivered one per tick, to each message's dst_node.
+        
+        Returns True if every logged reply was reproduced exactly.
         """
-        # Reset all nodes
-        for worker in self.workers.values():
-            worker.status = NodeStatus.IDLE
-            worker.inbox.clear()
-            worker.outbox.clear()
-            worker.tick = 0
+        if log is None:
+            log = self._message_log
+        elif not isinstance(log, MessageLog):
+            log = MessageLog.from_messages(log)
         
-        self.master.inbox.clear()
-        self.master.outbox.clear()
-        self.master.tick = 0
-        self.tick_count = 0
+        replica = self._replica()
+        workers = replica.workers
+        nodes = replica.bus.nodes
+        requests = frozenset(t for t in MessageType if t.is_request)
         
-        # Inject messages and run
-        for msg in log:
-            # Clone message
-            clone = Message(
-                msg_type=msg.msg_type,
-                msg_id=msg.msg_id,
-                src_node=msg.src_node,
-                dst_node=msg.dst_node,
-                payload=msg.payload,
-                flags=msg.flags,
-            )
-            self.master.send_message(clone)
-            self._tick()
+        # Expected replies: (src, dst) → frames, in delivery order
+        size = Message.FRAME_SIZE
+        ticks, srcs, dsts, frames = log.ticks, log.srcs, log.dsts, bytes(log.frames)
+        expected: Dict[Tuple[int, int], List[bytes]] = {}
+        for i, (src, dst) in enumerate(zip(srcs, dsts)):
+            if src in workers and frames[i * size] not in requests:
+                expected.setdefault((src, dst), []).append(frames[i * size:(i + 1) * size])
         
-        return True
+        # Step busy workers tick by tick up to the last logged delivery,
+        # jumping over idle stretches
+        actual: Dict[Tuple[int, int], List[bytes]] = {}
+        broadcast = MessageFlags.BROADCAST
+        message = log.message
+        count = len(dsts)
+        busy: List[int] = []
+        i = 0
+        now = 0
+        while i < count:
+            if busy or ticks[i] <= now:
+                now += 1
+            else:
+                now = ticks[i]
+            
+            for nid in busy:
+                worker = workers[nid]
+                worker.tick = now - 1
+                worker.step()
+                while True:
+                    msg = worker.get_outgoing()
+                    if msg is None:
+                        break
+                    if msg.msg_type not in requests:
+                        frame = msg.to_bytes()
+                        if msg.flags & broadcast:
+                            for dst in nodes:
+                                if dst != nid:
+                                    actual.setdefault((nid, dst), []).append(frame)
+                        elif msg.dst_node in nodes:
+                            actual.setdefault((nid, msg.dst_node), []).append(frame)
+                    msg.release()
+            
+            woken = False
+            while i < count and ticks[i] <= now:
+                dst = dsts[i]
+                worker = workers.get(dst)
+                if worker is not None:
+                    worker.tick = now
+                    worker.recv_message(message(i))
+                    if dst not in busy:
+                        busy.append(dst)
+                        woken = True
+                i += 1
+            
+            busy = [nid for nid in busy if not workers[nid].is_idle()]
+            if woken:
+                busy.sort()
+        
+        return all(
+            actual.get(link, [])[:len(replies)] == replies
+            for link, replies in expected.items()
+        )
+    
+    def _replica(self) -> 'HSquaresOS':
+        """
+        A fresh, unbooted system configured like this one, with
+        tracing and recording off.
+        
+        Workers get the same inbox/outbox sizes, budgets, op handlers,
+        neural processor and timeouts; memory starts zeroed.
+        """
+        replica = HSquaresOS(num_workers=self.num_workers, flow_control=self.bus.flow_control,
+                             memory=self.memory_model, trace_level='off', record=False)
+        for nid, worker in replica.workers.items():
+            source = self.workers[nid]
+            worker.inbox = deque(maxlen=source.inbox.maxlen)
+            worker.outbox = deque(maxlen=source.outbox.maxlen)
+            worker.quantum = source.quantum
+            worker.msg_costs = dict(source.msg_costs)
+            worker.op_backend = source.op_backend
+            worker._op_handlers = DispatchTable(source._op_handlers)
+            worker.neural_processor = source.neural_processor
+            worker.compute_max_batch = source.compute_max_batch
+            worker.compute_max_wait = source.compute_max_wait
+            worker.request_timeout = source.request_timeout
+            worker.frag_window = source.frag_window
+        return replica
     
     def snapshot(self) -> Dict:
         """
@@ -0,0 +1,220 @@
+"""
+TIMER WHEEL
+
+Hierarchical timing wheel: O(1) schedule, cancel and expiry.
+
+Four levels of 64 slots. Level 0 holds timers due within 64 ticks,
+one slot per tick; level L slots each span 64**L ticks. A timer is
+filed by how far away it is and moves down a level (cascades) when
+the wheel reaches the start of its slot, so each timer is touched
+at most once per level. Timers beyond the top level wait in an
+overflow list that is re-filed on every top-level cascade.
+
+Usage:
+    wheel = TimerWheel()
+    t = wheel.schedule(10, print, 'fired')
+    wheel.schedule_every(100, heartbeat)
+    wheel.cancel(t)
+    wheel.advance(now)       # fire everything due up to tick `now`
+"""
+
+from typing import Callable, List, Optional
+
+
+WHEEL_BITS = 6
+WHEEL_SIZE = 1 << WHEEL_BITS
+WHEEL_MASK = WHEEL_SIZE - 1
+WHEEL_LEVELS = 4
+
+
+class Timer:
+    """A scheduled callback. Keep it to cancel()."""
+    
+    __slots__ = ('due', 'callback', 'args', 'period', 'cancelled')
+    
+    def __init__(self, due: int, callback: Callable, args: tuple, period: int = 0):
+        self.due = due
+        self.callback = callback
+        self.args = args
+        self.period = period
+        self.cancelled = False
+    
+    def __repr__(self) -> str:
+        state = 'cancelled' if self.cancelled else f'due={self.due}'
+        every = f', every {self.period}' if self.period else ''
+        return f"Timer({getattr(self.callback, '__name__', 'callback')}, {state}{every})"
+
+
+class TimerWheel:
+    """
+    Hierarchical timing wheel driven by an external tick count.
+    
+    Callbacks run inside advance(), in due-tick order (scheduling order
+    within a tick).
+    """
+    
+    def __init__(self, now: int = 0):
+        self.now = now
+        self.levels: List[List[List[Timer]]] = [
+            [[] for _ in range(WHEEL_SIZE)] for _ in range(WHEEL_LEVELS)
+        ]
+        self.overflow: List[Timer] = []
+        self.filed = [0] * WHEEL_LEVELS  # Entries per level (incl. cancelled)
+        self.active = 0  # Scheduled and not cancelled
+        
+        # Statistics
+        self.fired = 0
+        self.cancelled = 0
+    
+    def __len__(self) -> int:
+        return self.active
+    
+    def _file(self, timer: Timer):
+        """Put a timer in the slot matching its distance from now."""
+        delta = timer.due - self.now
+        for level in range(WHEEL_LEVELS):
+            if delta < 1 << (WHEEL_BITS * (level + 1)):
+                slot = (timer.due >> (WHEEL_BITS * level)) & WHEEL_MASK
+                self.levels[level][slot].append(timer)
+                self.filed[level] += 1
+                return
+        self.overflow.append(timer)
+    
+    def schedule(self, after_ticks: int, callback: Callable, *args) -> Timer:
+        """Call callback(*args) after_ticks from now (at least one tick)."""
+        timer = Timer(self.now + max(1, after_ticks), callback, args)
+        self._file(timer)
+        self.active += 1
+        return timer
+    
+    def schedule_every(self, period: int, callback: Callable, *args) -> Timer:
+        """Call callback(*args) every `period` ticks until cancelled."""
+        if period < 1:
+            raise ValueError("period must be at least 1 tick")
+        timer = Timer(self.now + period, callback, args, period)
+        self._file(timer)
+        self.active += 1
+        return timer
+    
+    def cancel(self, timer: Timer) -> bool:
+        """Cancel a timer. Returns False if it already fired or was cancelled."""
+        if timer.cancelled or (timer.due <= self.now and not timer.period):
+            return False
+        timer.cancelled = True
+        self.active -= 1
+        self.cancelled += 1
+        return True
+    
+    def _cascade(self, level: int):
+        """Re-file the level's current slot into lower levels."""
+        slot = (self.now >> (WHEEL_BITS * level)) & WHEEL_MASK
+        timers = self.levels[level][slot]
+        if timers:
+            self.levels[level][slot] = []
+            self.filed[level] -= len(timers)
+            for timer in timers:
+                if not timer.cancelled:
+                    self._file(timer)
+    
+    def advance(self, now: int) -> int:
+        """Fire every timer due up to and including tick `now`. Returns number fired."""
+        fired = 0
+        level0 = self.levels[0]
+        filed = self.filed
+        while self.now < now:
+            if not self.active:
+                self.now = now  # Nothing scheduled: jump
+                break
+            
+            # Skip to just before the next slot boundary that has work
+            if not filed[0]:
+                level = 1
+                while level < WHEEL_LEVELS and not filed[level]:
+                    level += 1
+                span = 1 << (WHEEL_BITS * level)
+                boundary = (self.now | (span - 1)) + 1
+                if boundary > now:
+                    self.now = now
+                    break
+                self.now = boundary - 1
+            
+            self.now += 1
+            tick = self.now
+            
+            # Cascade higher levels at slot boundaries
+            if not tick & WHEEL_MASK:
+                level = 1
+                while level < WHEEL_LEVELS:
+                    self._cascade(level)
+                    if (tick >> (WHEEL_BITS * level)) & WHEEL_MASK:
+                        break
+                    level += 1
+                else:
+                    overflow, self.overflow = self.overflow, []
+                    for timer in overflow:
+                        if not timer.cancelled:
+                            self._file(timer)
+            
+            slot = tick & WHEEL_MASK
+            timers = level0[slot]
+            if not timers:
+                continue
+            level0[slot] = []
+            filed[0] -= len(timers)
+            for timer in timers:
+                if timer.cancelled:
+                    continue
+                if timer.period:
+                    timer.due += timer.period
+                    self._file(timer)
+                else:
+                    self.active -= 1
+                fired += 1
+                timer.callback(*timer.args)
+        
+        self.fired += fired
+        return fired
+    
+    def next_expiry(self) -> Optional[int]:
+        """
+        Lower bound on the next tick at which advance() has work.
+        
+        Either the due tick of a timer within 64 ticks or the tick of
+        the cascade that will bring a further one closer, whichever
+        comes first. None if nothing is scheduled.
+        """
+        if not self.active:
+            return None
+        
+        now = self.now
+        level0 = self.levels[0]
+        best = None
+        for tick in range(now + 1, now + WHEEL_SIZE + 1):
+            if any(not t.cancelled for t in level0[tick & WHEEL_MASK]):
+                best = tick
+                break
+        
+        # A cascade may bring a later-level timer in before that
+        for level in range(1, WHEEL_LEVELS):
+            shift = WHEEL_BITS * level
+            base = now >> shift
+            for k in range(1, WHEEL_SIZE + 1):
+                if any(not t.cancelled for t in self.levels[level][(base + k) & WHEEL_MASK]):
+                    tick = (base + k) << shift
+                    if best is None or tick < best:
+                        best = tick
+                    break
+        if self.overflow:
+            tick = ((now >> (WHEEL_BITS * WHEEL_LEVELS)) + 1) << (WHEEL_BITS * WHEEL_LEVELS)
+            if best is None or tick < best:
+                best = tick
+        return best
+    
+    def get_stats(self) -> dict:
+        """Get wheel statistics."""
+        return {
+            'now': self.now,
+            'active': self.active,
+            'fired': self.fired,
+            'cancelled': self.cancelled,
+        }
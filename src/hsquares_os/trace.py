@@ -0,0 +1,428 @@
+"""
+TRACE BUFFER
+
+Fixed-capacity ring buffer for fabric trace events.
+
+Every SEND/RECV on every node is traced, so appending must not
+allocate. Entries are stored column-wise in preallocated arrays:
+
+  ticks     array('q')  tick of the event
+  nodes     array('H')  node ID
+  events    array('B')  event code (see event_code)
+  types     array('B')  message type, NO_MSG_TYPE if none
+  msg_ids   array('H')  message ID
+  extras    list        free-form detail string ('' if none)
+
+Once full, each append overwrites the oldest entry. Readers ask for
+the last N entries and only those are turned into TraceEntry objects.
+
+Each node records into its own buffer; merge_tail() combines the
+tails of several buffers by (tick, node) only when a reader asks.
+
+query() selects entries by node, event, tick range and message ID
+without scanning: a buffer's ticks never decrease, so tick ranges
+are found by binary search, and a TraceIndex per buffer keeps
+posting lists of entry sequence numbers by event code and msg_id.
+Indexes are brought up to date by the query itself, reading only
+entries recorded since the previous one, so recording never pays
+for them.
+
+Trace levels select which events are recorded at all:
+
+  off       nothing
+  errors    ERROR, UNKNOWN, OVERFLOW, FRAG_LOST, TIMEOUT, QUARANTINE
+  control   errors plus RESET, HALT, DEFER and any other named event
+  full      everything, including per-message SEND and RECV
+
+Filters are applied by the producers (NodeKernel.set_trace,
+FabricKernel.set_trace) before anything is built.
+
+Usage:
+    buf = TraceBuffer(capacity=1000)
+    buf.append(tick, node, event_code('SEND'), MessageType.PING, 7)
+    buf.tail(20)      # last 20 entries, oldest first
+"""
+
+from array import array
+from bisect import bisect_left
+from collections import defaultdict
+from dataclasses import dataclass
+from heapq import merge
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from .message import MessageType
+
+
+# Message type column value for events without a message
+NO_MSG_TYPE = 0xFF
+
+# Event names ↔ codes. Names not listed are assigned codes on first use.
+EVENT_NAMES: List[str] = [
+    'SEND', 'RECV', 'DEFER', 'ERROR', 'UNKNOWN', 'OVERFLOW',
+    'FRAG_LOST', 'RESET', 'HALT', 'TIMEOUT', 'QUARANTINE',
+]
+EVENT_CODES: Dict[str, int] = {name: code for code, name in enumerate(EVENT_NAMES)}
+
+
+def event_code(name: str) -> int:
+    """Code for an event name, registering it if new."""
+    code = EVENT_CODES.get(name)
+    if code is None:
+        if len(EVENT_NAMES) > 0xFF:
+            raise ValueError(f"too many trace event names (registering {name!r})")
+        code = EVENT_CODES[name] = len(EVENT_NAMES)
+        EVENT_NAMES.append(name)
+    return code
+
+
+# Trace levels
+TRACE_OFF = 0
+TRACE_ERRORS = 1
+TRACE_CONTROL = 2
+TRACE_FULL = 3
+TRACE_LEVELS = ('off', 'errors', 'control', 'full')
+
+# Lowest level recording each event (unlisted events: TRACE_CONTROL)
+EVENT_LEVELS: Dict[str, int] = {
+    'ERROR': TRACE_ERRORS,
+    'UNKNOWN': TRACE_ERRORS,
+    'OVERFLOW': TRACE_ERRORS,
+    'FRAG_LOST': TRACE_ERRORS,
+    'TIMEOUT': TRACE_ERRORS,
+    'QUARANTINE': TRACE_ERRORS,
+    'SEND': TRACE_FULL,
+    'RECV': TRACE_FULL,
+}
+
+
+def parse_level(level: Union[str, int]) -> int:
+    """Resolve a level name ('off', 'errors', 'control', 'full') or number."""
+    if isinstance(level, str):
+        if level not in TRACE_LEVELS:
+            raise ValueError(f"unknown trace level: {level}")
+        return TRACE_LEVELS.index(level)
+    if not TRACE_OFF <= level <= TRACE_FULL:
+        raise ValueError(f"unknown trace level: {level}")
+    return level
+
+
+def trace_filter(level: Union[str, int], events: Optional[Iterable[str]] = None):
+    """
+    Build an event predicate for a level and optional event mask.
+    
+    Returns (level, only): record an event iff
+    EVENT_LEVELS.get(event, TRACE_CONTROL) <= level and (only is None
+    or event in only).
+    """
+    return parse_level(level), None if events is None else frozenset(events)
+
+
+def traced(event: str, level: int, only: Optional[frozenset]) -> bool:
+    """Does the filter (level, only) record this event?"""
+    return (
+        EVENT_LEVELS.get(event, TRACE_CONTROL) <= level
+        and (only is None or event in only)
+    )
+
+
+@dataclass
+class TraceEntry:
+    """Entry in the trace log."""
+    tick: int
+    node_id: int
+    event: str
+    msg_type: Optional[str] = None
+    msg_id: int = 0
+    extra: str = ''
+    
+    def __str__(self) -> str:
+        """Format as one dump_trace line."""
+        line = f"[{self.tick:6d}] Node {self.node_id}: {self.event}"
+        if self.msg_type:
+            line += f" ({self.msg_type} #{self.msg_id})"
+        if self.extra:
+            line += f" - {self.extra}"
+        return line
+
+
+class TraceBuffer:
+    """
+    Preallocated columnar ring buffer of trace events.
+    
+    len() is the number of entries held (at most capacity); `total`
+    counts every entry ever appended.
+    """
+    
+    def __init__(self, capacity: int = 1000):
+        if capacity < 1:
+            raise ValueError("trace capacity must be at least 1")
+        self.capacity = capacity
+        self.ticks = array('q', bytes(8 * capacity))
+        self.nodes = array('H', bytes(2 * capacity))
+        self.events = array('B', bytes(capacity))
+        self.types = array('B', bytes(capacity))
+        self.msg_ids = array('H', bytes(2 * capacity))
+        self.extras: List[str] = [''] * capacity
+        self._head = 0  # Next slot to write
+        self._discarded = 0  # Entries dropped by clear() or resize()
+        self.total = 0
+        self._index: Optional['TraceIndex'] = None
+    
+    def __len__(self) -> int:
+        return min(self.total - self._discarded, self.capacity)
+    
+    def append(self, tick: int, node: int, event: int,
+               msg_type: int = NO_MSG_TYPE, msg_id: int = 0, extra: str = ''):
+        """Record one event (event is a code from event_code)."""
+        i = self._head
+        self.ticks[i] = tick
+        self.nodes[i] = node
+        self.events[i] = event
+        self.types[i] = msg_type
+        self.msg_ids[i] = msg_id
+        self.extras[i] = extra
+        i += 1
+        self._head = 0 if i == self.capacity else i
+        self.total += 1
+    
+    def record(self, tick: int, node: int, event: str, msg=None, extra: str = ''):
+        """Record one event by name, with the type and ID of msg if given."""
+        if msg is None:
+            self.append(tick, node, event_code(event), NO_MSG_TYPE, 0, extra)
+        else:
+            self.append(tick, node, event_code(event), msg.msg_type, msg.msg_id, extra)
+    
+    def clear(self):
+        """Forget every entry (the arrays are kept)."""
+        self._head = 0
+        self._discarded = self.total
+    
+    def resize(self, capacity: int):
+        """Change capacity in place, keeping the newest entries that fit."""
+        if capacity < 1:
+            raise ValueError("trace capacity must be at least 1")
+        kept = [i for slots in self.slots(capacity) for i in slots]
+        self.ticks = array('q', (self.ticks[i] for i in kept))
+        self.nodes = array('H', (self.nodes[i] for i in kept))
+        self.events = array('B', (self.events[i] for i in kept))
+        self.types = array('B', (self.types[i] for i in kept))
+        self.msg_ids = array('H', (self.msg_ids[i] for i in kept))
+        self.extras = [self.extras[i] for i in kept]
+        
+        pad = capacity - len(kept)
+        self.ticks.extend(array('q', bytes(8 * pad)))
+        self.nodes.extend(array('H', bytes(2 * pad)))
+        self.events.extend(array('B', bytes(pad)))
+        self.types.extend(array('B', bytes(pad)))
+        self.msg_ids.extend(array('H', bytes(2 * pad)))
+        self.extras.extend([''] * pad)
+        
+        self.capacity = capacity
+        self._head = len(kept) % capacity
+        self._discarded = self.total - len(kept)
+    
+    # Entries are numbered by sequence: the n-th append is seq n-1,
+    # and the live entries are seqs first_seq .. total-1
+    
+    @property
+    def first_seq(self) -> int:
+        """Sequence number of the oldest entry held."""
+        return self.total - len(self)
+    
+    def slot(self, seq: int) -> int:
+        """Slot holding a live sequence number."""
+        return (self._head - (self.total - seq)) % self.capacity
+    
+    def seq_for_tick(self, tick: int) -> int:
+        """First live seq whose tick is >= tick (total if none); binary search."""
+        lo, hi = self.first_seq, self.total
+        ticks, head, total, capacity = self.ticks, self._head, self.total, self.capacity
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if ticks[(head - (total - mid)) % capacity] < tick:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+    
+    def index(self) -> 'TraceIndex':
+        """The buffer's query index, brought up to date."""
+        if self._index is None:
+            self._index = TraceIndex(self)
+        self._index.update()
+        return self._index
+    
+    def slots(self, last_n: Optional[int] = None) -> List[range]:
+        """Slots of the last_n newest entries, as ranges oldest first."""
+        held = len(self)
+        n = held if last_n is None else max(0, min(last_n, held))
+        start = (self._head - n) % self.capacity
+        if start + n <= self.capacity:
+            return [range(start, start + n)]
+        return [range(start, self.capacity), range(0, start + n - self.capacity)]
+    
+    def entry(self, slot: int) -> TraceEntry:
+        """Decode one slot."""
+        msg_type = self.types[slot]
+        if msg_type == NO_MSG_TYPE:
+            type_name = None
+        else:
+            try:
+                type_name = MessageType(msg_type).name
+            except ValueError:
+                type_name = f"0x{msg_type:02X}"
+        return TraceEntry(
+            tick=self.ticks[slot],
+            node_id=self.nodes[slot],
+            event=EVENT_NAMES[self.events[slot]],
+            msg_type=type_name,
+            msg_id=self.msg_ids[slot],
+            extra=self.extras[slot],
+        )
+    
+    def iter_tail(self, last_n: Optional[int] = None) -> Iterator[TraceEntry]:
+        """Iterate the last_n entries (all if None), oldest first."""
+        for slots in self.slots(last_n):
+            for slot in slots:
+                yield self.entry(slot)
+    
+    def tail(self, last_n: Optional[int] = None) -> List[TraceEntry]:
+        """The last_n entries (all if None), oldest first."""
+        return list(self.iter_tail(last_n))
+    
+    def __repr__(self) -> str:
+        return f"TraceBuffer({len(self)}/{self.capacity} entries, {self.total} total)"
+
+
+def merge_tail(buffers: Iterable[TraceBuffer],
+               last_n: Optional[int] = None) -> List[TraceEntry]:
+    """
+    The last_n entries across several buffers, ordered by (tick, node).
+    
+    Each buffer is in tick order, so only its own last_n entries can
+    make the merged tail; events of one buffer in the same tick keep
+    their recorded order.
+    """
+    rows = []
+    for buf in buffers:
+        ticks, nodes = buf.ticks, buf.nodes
+        for slots in buf.slots(last_n):
+            rows.extend((ticks[i], nodes[i], buf, i) for i in slots)
+    rows.sort(key=lambda row: (row[0], row[1]))
+    if last_n is not None:
+        rows = rows[max(0, len(rows) - last_n):]
+    return [buf.entry(i) for _, _, buf, i in rows]
+
+
+class TraceIndex:
+    """
+    Event and message-ID posting lists over one TraceBuffer.
+    
+    Lists hold sequence numbers in increasing order; entries since
+    overwritten are skipped when read and dropped when the index
+    grows past twice the buffer's capacity.
+    """
+    
+    def __init__(self, buf: TraceBuffer):
+        self.buf = buf
+        self.events: Dict[int, List[int]] = defaultdict(list)
+        self.msg_ids: Dict[int, List[int]] = defaultdict(list)
+        self.ordered = True  # Ticks never decrease (binary search is valid)
+        self._upto = 0  # Entries before this seq are indexed
+        self._size = 0
+        self._last_tick = None
+    
+    def update(self):
+        """Index every entry recorded since the last update."""
+        buf = self.buf
+        if self._size > 2 * buf.capacity:
+            self.events.clear()
+            self.msg_ids.clear()
+            self.ordered = True
+            self._upto = self._size = 0
+            self._last_tick = None
+        
+        start = max(self._upto, buf.first_seq)
+        if start >= buf.total:
+            return
+        ticks, events, types, msg_ids = buf.ticks, buf.events, buf.types, buf.msg_ids
+        by_event, by_id = self.events, self.msg_ids
+        last_tick, ordered = self._last_tick, self.ordered
+        for seq in range(start, buf.total):
+            slot = buf.slot(seq)
+            tick = ticks[slot]
+            if last_tick is not None and tick < last_tick:
+                ordered = False
+            last_tick = tick
+            by_event[events[slot]].append(seq)
+            if types[slot] != NO_MSG_TYPE:
+                by_id[msg_ids[slot]].append(seq)
+                self._size += 1
+        self._size += buf.total - start
+        self._last_tick, self.ordered = last_tick, ordered
+        self._upto = buf.total
+
+
+def _live(seqs: List[int], lo: int, hi: int) -> List[int]:
+    """The part of a sorted seq list within [lo, hi)."""
+    return seqs[bisect_left(seqs, lo):bisect_left(seqs, hi)]
+
+
+def query(buffers: Iterable[TraceBuffer],
+          node: Union[int, Iterable[int], None] = None,
+          event: Union[str, Iterable[str], None] = None,
+          tick_range: Optional[Tuple[int, int]] = None,
+          msg_id: Optional[int] = None,
+          limit: Optional[int] = None) -> List[TraceEntry]:
+    """
+    Entries matching every given criterion, ordered by (tick, node).
+    
+    node and event accept one value or several; tick_range is
+    (start, stop) with start <= tick < stop. limit keeps the last
+    `limit` matches.
+    """
+    nodes = None if node is None else (
+        frozenset((node,)) if isinstance(node, int) else frozenset(node))
+    if event is None:
+        codes = None
+    else:
+        names = (event,) if isinstance(event, str) else tuple(event)
+        codes = frozenset(EVENT_CODES[n] for n in names if n in EVENT_CODES)
+    
+    rows = []
+    for buf in buffers:
+        if not len(buf):
+            continue
+        index = buf.index()
+        lo, hi = buf.first_seq, buf.total
+        exact_ticks = tick_range is None
+        if tick_range is not None and index.ordered:
+            lo = max(lo, buf.seq_for_tick(tick_range[0]))
+            hi = min(hi, buf.seq_for_tick(tick_range[1]))
+            exact_ticks = True
+        if lo >= hi:
+            continue
+        
+        # Narrowest posting list first; the rest are checked per entry
+        if msg_id is not None:
+            seqs = _live(index.msg_ids.get(msg_id, []), lo, hi)
+        elif codes is not None:
+            seqs = list(merge(*(_live(index.events.get(c, []), lo, hi) for c in codes)))
+        else:
+            seqs = range(lo, hi)
+        
+        ticks, nodes_col, events = buf.ticks, buf.nodes, buf.events
+        for seq in seqs:
+            slot = buf.slot(seq)
+            if codes is not None and events[slot] not in codes:
+                continue
+            if nodes is not None and nodes_col[slot] not in nodes:
+                continue
+            if not exact_ticks and not tick_range[0] <= ticks[slot] < tick_range[1]:
+                continue
+            rows.append((ticks[slot], nodes_col[slot], buf, slot))
+    
+    rows.sort(key=lambda row: (row[0], row[1]))
+    if limit is not None:
+        rows = rows[max(0, len(rows) - limit):]
+    return [buf.entry(slot) for _, _, buf, slot in rows]
@@ -0,0 +1,316 @@
+"""
+TRACE FILES
+
+Streaming binary trace export for runs too long for the in-memory
+ring buffers.
+
+A TraceSink appends fixed-width 32-byte records to a series of
+rotating files (<path>.0000.hst, <path>.0001.hst, ...), batching
+writes in a preallocated buffer:
+
+  $00-$07  tick        Tick (little-endian, unsigned)
+  $08-$09  node        Node ID (little-endian)
+  $0A      event       Event code (see trace.event_code)
+  $0B      has_msg     1 if the frame below is a message, 0 if none
+  $0C-$0F  reserved
+  $10-$1F  frame       The traced message's 16-byte frame
+
+Each file starts with a header: magic, header length, record size,
+format version, then the event name table in effect when the file
+was opened, so a file decodes without the process that wrote it.
+Free-form trace detail strings are not stored.
+
+A TraceReader memory-maps the files and reads records on demand:
+len(), indexing, iteration, and binary search by tick (records are
+in trace order, and a running fabric traces ticks in increasing
+order). dump() converts them to the text format of
+FabricKernel.dump_trace().
+
+Usage:
+    sink = os.export_trace('run/trace')     # every traced event
+    os.run(1000000)
+    os.stop_trace_export()
+    
+    reader = TraceReader('run/trace')
+    reader[12345]                       # TraceRecord
+    reader.index_for_tick(500000)       # first record at tick >= 500000
+    print(reader.dump(start, stop))
+
+Command line:
+    python -m hsquares_os.trace_file run/trace [start [stop]]
+"""
+
+import glob
+import mmap
+import os
+import struct
+import sys
+from bisect import bisect_right
+from typing import Iterator, List, NamedTuple, Optional, Sequence, Union
+
+from .message import Message, MessageType, MessageFlags
+from .trace import EVENT_NAMES, TraceEntry, event_code
+
+
+MAGIC = b'HSQTRACE'
+HEADER_STRUCT = struct.Struct('<8sIHH')  # magic, header length, record size, version
+FORMAT_VERSION = 2  # 1 (version field 0): one-byte node IDs
+RECORD_STRUCT = struct.Struct('<QHBB4x16s')
+RECORD_SIZE = RECORD_STRUCT.size
+FILE_SUFFIX = '.hst'
+
+_NO_FRAME = bytes(Message.FRAME_SIZE)
+_WIDE_ID = MessageFlags.WIDE_ID
+
+
+class TraceRecord(NamedTuple):
+    """One record read back from a trace file."""
+    tick: int
+    node: int
+    event: str
+    frame: Optional[bytes]  # None: the event had no message
+    
+    @property
+    def message(self) -> Optional[Message]:
+        """The traced message, decoded from its frame."""
+        return None if self.frame is None else Message.from_bytes(self.frame)
+    
+    def entry(self) -> TraceEntry:
+        """As a TraceEntry (without detail text)."""
+        if self.frame is None:
+            return TraceEntry(self.tick, self.node, self.event)
+        frame = self.frame
+        msg_id = frame[1]
+        if frame[5] & _WIDE_ID:
+            msg_id |= frame[4] << 8
+        try:
+            type_name = MessageType(frame[0]).name
+        except ValueError:
+            type_name = f"0x{frame[0]:02X}"
+        return TraceEntry(self.tick, self.node, self.event, type_name, msg_id)
+
+
+class TraceSink:
+    """
+    Buffered, rotating binary trace writer.
+    
+    Usable directly as a NodeKernel.trace_callback. Records are
+    packed into a buffer of buffer_records and written when it fills;
+    a new file is started once a file reaches max_bytes.
+    """
+    
+    def __init__(self, path: str, max_bytes: int = 64 << 20, buffer_records: int = 4096):
+        header = _header()
+        if max_bytes < len(header) + RECORD_SIZE:
+            raise ValueError("max_bytes too small for one record")
+        if buffer_records < 1:
+            raise ValueError("buffer_records must be at least 1")
+        self.path = path
+        self.records_per_file = (max_bytes - len(header)) // RECORD_SIZE
+        self.buffer_records = buffer_records
+        self.files: List[str] = []
+        self.records = 0  # Records written in total
+        
+        self._buffer = bytearray(buffer_records * RECORD_SIZE)
+        self._buffered = 0
+        self._in_file = 0  # Records in the current file (written or buffered)
+        self._file = None
+        
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._open_next()
+    
+    def _open_next(self):
+        """Close the current file and start the next one."""
+        if self._file is not None:
+            self._file.close()
+        name = f"{self.path}.{len(self.files):04d}{FILE_SUFFIX}"
+        self._file = open(name, 'wb')
+        self._file.write(_header())
+        self.files.append(name)
+        self._in_file = 0
+    
+    def write(self, tick: int, node: int, event: int, frame: Optional[bytes] = None):
+        """Append one record (event is a code from trace.event_code)."""
+        if self._in_file == self.records_per_file:
+            self.flush()
+            self._open_next()
+        if frame is None:
+            RECORD_STRUCT.pack_into(self._buffer, self._buffered * RECORD_SIZE,
+                                    tick, node, event, 0, _NO_FRAME)
+        else:
+            RECORD_STRUCT.pack_into(self._buffer, self._buffered * RECORD_SIZE,
+                                    tick, node, event, 1, frame)
+        self._buffered += 1
+        self._in_file += 1
+        self.records += 1
+        if self._buffered == self.buffer_records:
+            self.flush()
+    
+    def __call__(self, node_id: int, tick: int, event: str,
+                 msg: Optional[Message] = None, extra: str = ''):
+        """Trace callback: record one event (extra is not stored)."""
+        self.write(tick, node_id, event_code(event),
+                   None if msg is None else msg.to_bytes())
+    
+    def flush(self):
+        """Write buffered records to the current file."""
+        if self._buffered and self._file is not None:
+            self._file.write(memoryview(self._buffer)[:self._buffered * RECORD_SIZE])
+            self._file.flush()
+            self._buffered = 0
+    
+    def close(self):
+        """Flush and close the current file."""
+        if self._file is not None:
+            self.flush()
+            self._file.close()
+            self._file = None
+    
+    def __enter__(self) -> 'TraceSink':
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+    
+    def __repr__(self) -> str:
+        return f"TraceSink({self.path!r}, {self.records} records, {len(self.files)} files)"
+
+
+class TraceReader:
+    """
+    Memory-mapped reader over one or more trace files.
+    
+    path may be a sink's base path (all its rotated files, in order),
+    a single file, or a list of files.
+    """
+    
+    def __init__(self, path: Union[str, Sequence[str]]):
+        if isinstance(path, str):
+            files = sorted(glob.glob(glob.escape(path) + '.[0-9]*' + FILE_SUFFIX))
+            if not files:
+                files = [path]
+        else:
+            files = list(path)
+        
+        self.files = files
+        self._maps: List[mmap.mmap] = []
+        self._offsets: List[int] = []  # Header length per file
+        self._names: List[List[str]] = []  # Event names per file
+        self._starts: List[int] = []  # Index of each file's first record
+        total = 0
+        for name in files:
+            with open(name, 'rb') as f:
+                data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, header_len, record_size, version = HEADER_STRUCT.unpack_from(data)
+            if magic != MAGIC or record_size != RECORD_SIZE:
+                data.close()
+                raise ValueError(f"{name}: not a trace file")
+            if version != FORMAT_VERSION:
+                data.close()
+                raise ValueError(f"{name}: trace format version {version or 1}, "
+                                 f"expected {FORMAT_VERSION}")
+            names = bytes(data[HEADER_STRUCT.size:header_len]).decode().split('\n')
+            self._maps.append(data)
+            self._offsets.append(header_len)
+            self._names.append(names)
+            self._starts.append(total)
+            total += (len(data) - header_len) // RECORD_SIZE
+        self._count = total
+    
+    def __len__(self) -> int:
+        return self._count
+    
+    def _locate(self, index: int):
+        """(file number, byte offset) of a record."""
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("trace record index out of range")
+        n = bisect_right(self._starts, index) - 1
+        return n, self._offsets[n] + (index - self._starts[n]) * RECORD_SIZE
+    
+    def __getitem__(self, index: int) -> TraceRecord:
+        n, offset = self._locate(index)
+        tick, node, code, has_msg, frame = RECORD_STRUCT.unpack_from(self._maps[n], offset)
+        names = self._names[n]
+        if code < len(names):
+            event = names[code]
+        elif code < len(EVENT_NAMES):
+            event = EVENT_NAMES[code]
+        else:
+            event = f"EVENT_{code}"
+        return TraceRecord(tick, node, event, frame if has_msg else None)
+    
+    def tick(self, index: int) -> int:
+        """Tick of a record, without decoding the rest."""
+        n, offset = self._locate(index)
+        return struct.unpack_from('<Q', self._maps[n], offset)[0]
+    
+    def index_for_tick(self, tick: int) -> int:
+        """Index of the first record at or after tick (len() if none)."""
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.tick(mid) < tick:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+    
+    def __iter__(self) -> Iterator[TraceRecord]:
+        return self.records()
+    
+    def records(self, start: int = 0, stop: Optional[int] = None) -> Iterator[TraceRecord]:
+        """Iterate records start..stop-1 (by index)."""
+        stop = self._count if stop is None else min(stop, self._count)
+        for index in range(max(0, start), stop):
+            yield self[index]
+    
+    def between(self, start_tick: int, stop_tick: int) -> Iterator[TraceRecord]:
+        """Iterate records with start_tick <= tick < stop_tick."""
+        return self.records(self.index_for_tick(start_tick), self.index_for_tick(stop_tick))
+    
+    def dump(self, start: int = 0, stop: Optional[int] = None) -> str:
+        """Records start..stop-1 in FabricKernel.dump_trace() text format."""
+        return "\n".join(str(record.entry()) for record in self.records(start, stop))
+    
+    def close(self):
+        """Unmap every file."""
+        for data in self._maps:
+            data.close()
+        self._maps = []
+    
+    def __enter__(self) -> 'TraceReader':
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+    
+    def __repr__(self) -> str:
+        return f"TraceReader({len(self.files)} files, {self._count} records)"
+
+
+def _header() -> bytes:
+    """File header with the current event name table."""
+    names = '\n'.join(EVENT_NAMES).encode()
+    return HEADER_STRUCT.pack(MAGIC, HEADER_STRUCT.size + len(names), RECORD_SIZE,
+                              FORMAT_VERSION) + names
+
+
+def main(argv: Optional[List[str]] = None):
+    """Print trace files as text: trace_file.py <path> [start [stop]]"""
+    args = sys.argv[1:] if argv is None else argv
+    if not args:
+        print("usage: python -m hsquares_os.trace_file <path> [start [stop]]")
+        return
+    start = int(args[1]) if len(args) > 1 else 0
+    stop = int(args[2]) if len(args) > 2 else None
+    with TraceReader(args[0]) as reader:
+        for record in reader.records(start, stop):
+            print(record.entry())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,6 @@
+"""Make the in-tree package importable without installing it."""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
@@ -0,0 +1,33 @@
+"""AsyncHSquaresOS."""
+
+import asyncio
+
+from hsquares_os import HSquaresOS, AsyncHSquaresOS
+from hsquares_os.node_kernel import OpCode
+
+
+def test_more_callers_than_window_all_answered():
+    os = HSquaresOS()
+    os.boot()
+    aos = AsyncHSquaresOS(os)
+    callers = 500
+    assert callers > os.max_in_flight
+    
+    async def main():
+        return await asyncio.gather(*(
+            aos.exec_async(node=1 + i % 8, op=OpCode.ADD, a=i & 0xFF, b=1)
+            for i in range(callers)
+        ))
+    
+    results = asyncio.run(main())
+    assert all(result is not None for result in results)
+    assert [result[0] for result in results] == [((i & 0xFF) + 1) & 0xFF for i in range(callers)]
+    assert os.requests_expired == 0
+    assert aos.outstanding == 0
+
+
+def test_timeout_resolves_to_none():
+    os = HSquaresOS(num_workers=2)
+    os.boot()
+    aos = AsyncHSquaresOS(os)
+    assert asyncio.run(aos.exec_async(node=7, op=OpCode.ADD, a=1, b=2, timeout=10)) is None
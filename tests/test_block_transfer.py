@@ -0,0 +1,52 @@
+"""Size limits of streamed LOAD/DUMP transfers."""
+
+import pytest
+
+from hsquares_os import HSquaresOS
+from hsquares_os.node_kernel import MAX_STREAM_BYTES, OpCode
+
+
+@pytest.fixture
+def os():
+    system = HSquaresOS(num_workers=2)
+    system.boot()
+    return system
+
+
+def test_load_block_at_limit(os):
+    data = bytes(i & 0xFF for i in range(MAX_STREAM_BYTES - 2))
+    assert os.load_block(1, 0, data)
+    assert os.workers[1].read_block(0, 512) == data[:512]
+
+
+def test_load_block_too_long_rejected_before_submit(os):
+    with pytest.raises(ValueError):
+        os.load_block(1, 0, bytes(MAX_STREAM_BYTES - 1))
+    assert not os._pending_responses
+    assert os._in_flight == 0
+    assert os.exec(1, OpCode.ADD, 2, 3) is not None  # Window still usable
+    assert os.drain() == 0
+
+
+def test_dump_at_limit(os):
+    os.workers[1].write_block(0xFFF0, b'\x5a' * 16)
+    data = os.dump(1, 0, 0xFFFF)
+    assert len(data) == 0xFFFF
+    assert data[0xFFF0:] == b'\x5a' * 15
+
+
+@pytest.mark.parametrize('length', [-1, 0x10000])
+def test_dump_length_out_of_range(os, length):
+    with pytest.raises(ValueError):
+        os.dump(1, 0, length)
+    assert not os._pending_responses
+
+
+def test_failed_stream_send_releases_window(os, monkeypatch):
+    def fail(*args):
+        raise RuntimeError("link down")
+    monkeypatch.setattr(os.master, 'send_stream', fail)
+    with pytest.raises(RuntimeError):
+        os.submit_load_block(1, 0, b'abc')
+    assert not os._pending_responses
+    assert os._in_flight == 0
@@ -0,0 +1,33 @@
+"""Request deadlines."""
+
+from hsquares_os import HSquaresOS
+from hsquares_os.node_kernel import OpCode
+
+
+def test_default_timeout_ignores_time_queued():
+    os = HSquaresOS(request_timeout=50)
+    os.boot()
+    handles = [os.submit(1 + i % 8, OpCode.ADD, i & 0xFF, 1) for i in range(2000)]
+    os.drain()
+    assert all(h.ok for h in handles)
+    assert os.requests_expired == 0
+
+
+def test_default_timeout_expires_unanswered_request():
+    os = HSquaresOS(num_workers=2, request_timeout=20)
+    os.boot()
+    handle = os.submit(7, OpCode.ADD, 1, 2)  # No such node: dropped on the bus
+    ticks = os.drain()
+    assert handle.done and handle.expired
+    assert 20 <= ticks <= 22
+    assert os.requests_expired == 1
+
+
+def test_explicit_deadline_counts_from_submission():
+    os = HSquaresOS(num_workers=1)
+    os.boot()
+    handles = [os.submit(1, OpCode.ADD, i & 0xFF, 1) for i in range(100)]
+    for handle in handles:
+        os.set_deadline(handle, 10)
+    os.drain()
+    assert any(h.expired and not h.sent for h in handles)